@@ -1,10 +1,59 @@
+from bson import ObjectId
+from fastapi import HTTPException
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from app.config import settings
 
 # Connect to MongoDB
-client = AsyncIOMotorClient(settings.MONGO_URI)
+client = AsyncIOMotorClient(
+    settings.MONGO_URI,
+    maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+    compressors=settings.MONGO_COMPRESSORS,
+    zlibCompressionLevel=3,
+    serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS,
+)
 db = client[settings.DATABASE_NAME]
 
+# Indexes backing the match list queries ($or on either player id, by tournament, newest first)
+MATCH_INDEXES = [
+    IndexModel([("player1_id", ASCENDING), ("date", DESCENDING)]),
+    IndexModel([("player2_id", ASCENDING), ("date", DESCENDING)]),
+    IndexModel([("tournament_id", ASCENDING), ("date", DESCENDING)]),
+    IndexModel([("date", DESCENDING), ("_id", DESCENDING)]),
+]
+
+# Indexes backing the leaderboard sort and the username / email existence checks
+USER_INDEXES = [
+    IndexModel([("points", DESCENDING), ("goal_difference", DESCENDING)]),
+    IndexModel([("username", ASCENDING)], unique=True),
+    IndexModel([("email", ASCENDING)]),
+]
+
 async def get_database():
     """Get database dependency for dependency injection"""
     return db
+
+async def ensure_indexes():
+    """Create the collection indexes; existing indexes with the same spec are left untouched"""
+    await db.matches.create_indexes(MATCH_INDEXES)
+    await db.users.create_indexes(USER_INDEXES)
+
+def parse_object_id(value: str, detail: str) -> ObjectId:
+    """Parse an ID once, answering 400 instead of raising on malformed input"""
+    if not ObjectId.is_valid(value):
+        raise HTTPException(status_code=400, detail=detail)
+    return ObjectId(value)
+
+def parse_player_id(player_id: str) -> ObjectId:
+    """Path dependency: the player_id path parameter as an ObjectId"""
+    return parse_object_id(player_id, "Invalid player ID format")
+
+def parse_match_id(match_id: str) -> ObjectId:
+    """Path dependency: the match_id path parameter as an ObjectId"""
+    return parse_object_id(match_id, "Invalid ID format")
+
+def parse_tournament_id(tournament_id: str) -> ObjectId:
+    """Path dependency: the tournament_id path parameter as an ObjectId"""
+    return parse_object_id(tournament_id, "Invalid tournament ID format")
@@ -37,7 +37,7 @@ async def check_username_exists(username_data: UsernameCheck):
     db = await get_database()
     
     # Check if username already exists
-    existing_user = await db.users.find_one({"username": username_data.username})
+    existing_user = await db.users.find_one({"username": username_data.username}, {"_id": 1})
     
     return {
         "username": username_data.username,
@@ -51,7 +51,7 @@ async def register_user(user: UserCreate):
     db = await get_database()
     
     # Check if username already exists
-    existing_user = await db.users.find_one({"username": user.username})
+    existing_user = await db.users.find_one({"username": user.username}, {"_id": 1})
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -59,7 +59,7 @@ async def register_user(user: UserCreate):
         )
     
     # Check if email already exists
-    existing_email = await db.users.find_one({"email": user.email})
+    existing_email = await db.users.find_one({"email": user.email}, {"_id": 1})
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -102,8 +102,8 @@ async def register_user(user: UserCreate):
     # Insert user into database
     result = await db.users.insert_one(user_data)
     
-    # Get created user
-    created_user = await db.users.find_one({"_id": result.inserted_id})
+    # Build the created user from the inserted document instead of re-reading it
+    created_user = {**user_data, "_id": result.inserted_id}
     
     return User(**user_helper(created_user))
 
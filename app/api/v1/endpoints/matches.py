@@ -1,13 +1,16 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
 from bson import ObjectId
+from pymongo import UpdateOne
 from datetime import datetime
+import asyncio
 
 from app.models import MatchCreate, Match, MatchUpdate, Player, Tournament
 from app.models.auth import UserInDB
-from app.api.dependencies import get_database
-from app.utils.helpers import match_helper, get_result
+from app.api.dependencies import get_database, parse_match_id
+from app.utils.helpers import match_helper, match_helpers_batch, get_result, match_outcome, matches_with_players_pipeline
 from app.utils.auth import get_current_active_user
+from app.utils.caches import invalidate_player_stats
 from app.utils.logging import get_logger
 from app.utils.elo import calculate_elo_ratings
 from app.config import settings
@@ -16,12 +19,23 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
+
+async def _find_match_with_names(db, match_id: ObjectId):
+    """Fetch one match with its players and tournament joined in a single aggregation"""
+    matches = await db.matches.aggregate(matches_with_players_pipeline({"_id": match_id}, limit=1)).to_list(1)
+    return matches[0] if matches else None
+
+
 @router.post("/", response_model=Match)
 async def record_match(match: MatchCreate, current_user: UserInDB = Depends(get_current_active_user)):
     """Record a new match"""
     db = await get_database()
-    player1 : Player = await db.users.find_one({"_id": ObjectId(match.player1_id)})
-    player2 : Player = await db.users.find_one({"_id": ObjectId(match.player2_id)})
+    player1 : Player
+    player2 : Player
+    player1, player2 = await asyncio.gather(
+        db.users.find_one({"_id": ObjectId(match.player1_id)}, {"username": 1, "is_deleted": 1, "elo_rating": 1, "last_5_teams": 1}),
+        db.users.find_one({"_id": ObjectId(match.player2_id)}, {"username": 1, "is_deleted": 1, "elo_rating": 1, "last_5_teams": 1}),
+    )
 
     if not player1 or not player2:
         raise HTTPException(status_code=404, detail="One or both players not found")
@@ -31,19 +45,17 @@ async def record_match(match: MatchCreate, current_user: UserInDB = Depends(get_
     new_match = await db.matches.insert_one(match_dict)
 
     # Only update tournament if tournament_id is provided
+    tournaments_cache = {}
     if match.tournament_id:
-        tournament : Tournament = await db.tournaments.find_one({"_id": ObjectId(match.tournament_id)})
+        # $push / $inc create the fields on older tournaments that lack them
+        tournament : Tournament = await db.tournaments.find_one_and_update(
+            {"_id": ObjectId(match.tournament_id)},
+            {"$push": {"matches": new_match.inserted_id}, "$inc": {"matches_count": 1}},
+            projection={"name": 1},
+        )
         if not tournament:
             raise HTTPException(status_code=404, detail="Tournament not found")
-
-        # Initialize matches field if it doesn't exist (for backward compatibility)
-        if "matches" not in tournament:
-            tournament["matches"] = []
-        if "matches_count" not in tournament:
-            tournament["matches_count"] = 0
-
-        tournament["matches"].append(new_match.inserted_id)
-        await db.tournaments.update_one({"_id": ObjectId(match.tournament_id)}, {"$set": {"matches": tournament["matches"], "matches_count": tournament["matches_count"] + 1}})
+        tournaments_cache[match.tournament_id] = tournament
 
     # Calculate new ELO ratings for both players
     player1_current_elo = player1.get("elo_rating", settings.DEFAULT_ELO_RATING)
@@ -56,7 +68,8 @@ async def record_match(match: MatchCreate, current_user: UserInDB = Depends(get_
         match.player2_goals
     )
     
-    # Update player stats and ELO ratings
+    # Update player stats and ELO ratings in a single bulk write
+    player_updates = []
     for player, goals_scored, goals_conceded, new_elo, team_played in [
         (player1, match.player1_goals, match.player2_goals, new_player1_elo, match.team1),
         (player2, match.player2_goals, match.player1_goals, new_player2_elo, match.team2),
@@ -94,25 +107,51 @@ async def record_match(match: MatchCreate, current_user: UserInDB = Depends(get_
                 "last_5_teams": updated_teams
             }
         }
-        await db.users.update_one({"_id": player["_id"]}, update)
+        player_updates.append(UpdateOne({"_id": player["_id"]}, update))
+    await db.users.bulk_write(player_updates, ordered=False)
+    invalidate_player_stats(match.player1_id, match.player2_id)
 
-    created_match = await db.matches.find_one({"_id": new_match.inserted_id})
-    return Match(**await match_helper(created_match, db))
+    # Build the response from what was just written and the players already loaded
+    created_match = {**match_dict, "_id": new_match.inserted_id}
+    players_cache = {match.player1_id: player1, match.player2_id: player2}
+    return await match_helper(created_match, db, players_cache, tournaments_cache)
 
 @router.get("/", response_model=List[Match])
-async def get_matches(current_user: UserInDB = Depends(get_current_active_user)):
-    """Get all matches"""
+async def get_matches(
+    limit: int = Query(settings.MAX_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE, description="Maximum number of matches to return"),
+    cursor: Optional[str] = Query(None, description="ID of the last match of the previous page; returns the matches after it"),
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    """Get matches, newest first, paginated by keyset cursor"""
     db = await get_database()
-    matches = await db.matches.find().sort("date", -1).to_list(1000)
-    logger.debug(f"Retrieved {len(matches)} matches")
-    return [Match(**await match_helper(match, db)) for match in matches]
+    
+    # Keyset pagination on (date, _id) so pages stay stable while matches are being recorded
+    match_filter = None
+    if cursor:
+        if not ObjectId.is_valid(cursor):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        cursor_id = ObjectId(cursor)
+        cursor_match = await db.matches.find_one({"_id": cursor_id}, {"date": 1})
+        if not cursor_match:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        match_filter = {"$or": [
+            {"date": {"$lt": cursor_match.get("date")}},
+            {"date": cursor_match.get("date"), "_id": {"$lt": cursor_id}},
+        ]}
+    
+    matches = await db.matches.aggregate(
+        matches_with_players_pipeline(match_filter, sort={"date": -1, "_id": -1}, limit=limit)
+    ).to_list(None)
+    logger.debug("Retrieved %s matches", len(matches))
+    # Rows are validated once by FastAPI against response_model, not per row here
+    return await match_helpers_batch(matches, db)
 
 @router.put("/{match_id}", response_model=Match)
-async def update_match(match_id: str, match_update: MatchUpdate, current_user: UserInDB = Depends(get_current_active_user)):
+async def update_match(match_id: str, match_update: MatchUpdate, match_oid: ObjectId = Depends(parse_match_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Update a match"""
     try:
         db = await get_database()
-        match : Match = await db.matches.find_one({"_id": ObjectId(match_id)})
+        match : Match = await db.matches.find_one({"_id": match_oid})
         if not match:
             raise HTTPException(status_code=404, detail="Match not found")
         
@@ -128,7 +167,7 @@ async def update_match(match_id: str, match_update: MatchUpdate, current_user: U
         
         # Check if there are any actual changes
         if player1_goals_diff == 0 and player2_goals_diff == 0:
-            return Match(**await match_helper(match, db))
+            return await match_helper(match, db)
         
         # Update match
         update_data = {
@@ -138,7 +177,7 @@ async def update_match(match_id: str, match_update: MatchUpdate, current_user: U
         }
         
         update_result = await db.matches.update_one(
-            {"_id": ObjectId(match_id)},
+            {"_id": match_oid},
             {"$set": update_data},
         )
         
@@ -146,8 +185,12 @@ async def update_match(match_id: str, match_update: MatchUpdate, current_user: U
             raise HTTPException(status_code=400, detail="Match update failed - match not found")
         
         # Get current player data for ELO calculation
-        player1 : Player = await db.users.find_one({"_id": ObjectId(match["player1_id"])})
-        player2 : Player = await db.users.find_one({"_id": ObjectId(match["player2_id"])})
+        player1 : Player
+        player2 : Player
+        player1, player2 = await asyncio.gather(
+            db.users.find_one({"_id": ObjectId(match["player1_id"])}, {"elo_rating": 1}),
+            db.users.find_one({"_id": ObjectId(match["player2_id"])}, {"elo_rating": 1}),
+        )
         
         if not player1 or not player2:
             raise HTTPException(status_code=404, detail="One or both players not found")
@@ -172,105 +215,89 @@ async def update_match(match_id: str, match_update: MatchUpdate, current_user: U
             match_update.player2_goals
         )
         
-        # Update player stats and ELO ratings
-        for player_id, goals_diff, opponent_goals_diff, new_elo in [
-            (match["player1_id"], player1_goals_diff, player2_goals_diff, new_player1_elo),
-            (match["player2_id"], player2_goals_diff, player1_goals_diff, new_player2_elo),
+        # Update player stats and ELO ratings in a single bulk write, reusing the players loaded above
+        player_updates = []
+        for player, goals_diff, opponent_goals_diff, old_goals, new_goals, new_elo in [
+            (player1, player1_goals_diff, player2_goals_diff,
+             (match["player1_goals"], match["player2_goals"]),
+             (match_update.player1_goals, match_update.player2_goals), new_player1_elo),
+            (player2, player2_goals_diff, player1_goals_diff,
+             (match["player2_goals"], match["player1_goals"]),
+             (match_update.player2_goals, match_update.player1_goals), new_player2_elo),
         ]:
-            if not ObjectId.is_valid(player_id):
-                continue
-            
-            player : Player = await db.users.find_one({"_id": ObjectId(player_id)})
-            if not player:
-                continue
-            
-            # Calculate win/loss/draw changes
-            old_result = get_result(
-                match["player1_goals"],
-                match["player2_goals"],
-                player_id == match["player1_id"],
-            )
-            new_result = get_result(
-                match_update.player1_goals,
-                match_update.player2_goals,
-                player_id == match["player1_id"],
-            )
-            wins_diff = new_result["win"] - old_result["win"]
-            losses_diff = new_result["loss"] - old_result["loss"]
-            draws_diff = new_result["draw"] - old_result["draw"]
+            # Calculate win/loss/draw/points changes; the match itself is still counted once
+            old_wins, old_losses, old_draws, old_points = match_outcome(*old_goals)
+            new_wins, new_losses, new_draws, new_points = match_outcome(*new_goals)
+            wins_diff = new_wins - old_wins
+            losses_diff = new_losses - old_losses
+            draws_diff = new_draws - old_draws
 
             if goals_diff == 0 and opponent_goals_diff == 0 and wins_diff == 0 and losses_diff == 0 and draws_diff == 0:
                 continue
             
             update = {
                 "$inc": {
-                    "total_matches": 1,
                     "total_goals_scored": goals_diff,
                     "total_goals_conceded": opponent_goals_diff,
                     "goal_difference" : goals_diff - opponent_goals_diff,
                     "wins": wins_diff,
                     "losses": losses_diff,
                     "draws": draws_diff,
-                    "points": (
-                        3
-                        if goals_diff > opponent_goals_diff
-                        else (1 if goals_diff == opponent_goals_diff else 0)
-                    ),
+                    "points": new_points - old_points,
                 },
                 "$set": {
                     "elo_rating": new_elo
                 }
             }
-            update_result = await db.users.update_one({"_id": player["_id"]}, update)
-            if update_result.modified_count == 0:
+            player_updates.append(UpdateOne({"_id": player["_id"]}, update))
+        
+        if player_updates:
+            bulk_result = await db.users.bulk_write(player_updates, ordered=False)
+            invalidate_player_stats(match["player1_id"], match["player2_id"])
+            if bulk_result.modified_count < len(player_updates):
                 raise HTTPException(status_code=400, detail="Player update failed")
 
         # Fetch updated match
-        updated_match = await db.matches.find_one({"_id": ObjectId(match_id)})
+        updated_match = await _find_match_with_names(db, match_oid)
         if not updated_match:
             raise HTTPException(status_code=404, detail="Updated match not found")
 
-        return Match(**await match_helper(updated_match, db))
+        return await match_helper(updated_match, db)
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error updating match: {str(e)}")
-        if "Invalid ObjectId" in str(e):
-            raise HTTPException(status_code=400, detail="Invalid ID format")
+        logger.error("Error updating match: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/{match_id}", response_model=dict)
-async def delete_match(match_id: str, current_user: UserInDB = Depends(get_current_active_user)):
+async def delete_match(match_id: str, match_oid: ObjectId = Depends(parse_match_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Delete a match and update tournament and player statistics"""
     try:
         db = await get_database()
-        match : Match = await db.matches.find_one({"_id": ObjectId(match_id)})
+        match : Match = await db.matches.find_one({"_id": match_oid})
         if not match:
             raise HTTPException(status_code=404, detail="Match not found")
 
         # Store match data before deletion for statistics recalculation
         match_data = match.copy()
-        logger.info(f"Deleting match {match_id} between players {match.get('player1_id')} and {match.get('player2_id')}")
+        logger.info("Deleting match %s between players %s and %s", match_id, match.get('player1_id'), match.get('player2_id'))
 
         # Remove match from tournament if it exists
         if match.get("tournament_id"):
-            tournament : Tournament = await db.tournaments.find_one({"_id": ObjectId(match["tournament_id"])})
-            if tournament:
-                # Remove match from tournament's matches list
-                if "matches" in tournament and ObjectId(match_id) in tournament["matches"]:
-                    tournament["matches"].remove(ObjectId(match_id))
-                    await db.tournaments.update_one(
-                        {"_id": ObjectId(match["tournament_id"])},
-                        {
-                            "$set": {
-                                "matches": tournament["matches"],
-                                "matches_count": max(0, tournament.get("matches_count", 0) - 1)
-                            }
-                        }
-                    )
+            # Remove match from tournament's matches list, only if it is listed there
+            await db.tournaments.update_one(
+                {"_id": ObjectId(match["tournament_id"]), "matches": match_oid},
+                {"$pull": {"matches": match_oid}, "$inc": {"matches_count": -1}}
+            )
 
         # Get current player data for ELO calculation
-        player1 : Player = await db.users.find_one({"_id": ObjectId(match["player1_id"])})
-        player2 : Player = await db.users.find_one({"_id": ObjectId(match["player2_id"])})
+        player1 : Player
+        player2 : Player
+        player1, player2 = await asyncio.gather(
+            db.users.find_one({"_id": ObjectId(match["player1_id"])}, {"elo_rating": 1}),
+            db.users.find_one({"_id": ObjectId(match["player2_id"])}, {"elo_rating": 1}),
+        )
         
         if not player1 or not player2:
             raise HTTPException(status_code=404, detail="One or both players not found")
@@ -295,13 +322,13 @@ async def delete_match(match_id: str, current_user: UserInDB = Depends(get_curre
             if not ObjectId.is_valid(player_id):
                 continue
                 
-            player : Player = await db.users.find_one({"_id": ObjectId(player_id)})
+            player : Player = await db.users.find_one({"_id": ObjectId(player_id)}, {"_id": 1})
             if not player:
                 continue
             
             # Calculate the result for this player
             is_player1 = player_id == match["player1_id"]
-            result = get_result(match["player1_goals"], match["player2_goals"], is_player1)
+            wins, losses, draws, points = get_result(match["player1_goals"], match["player2_goals"], is_player1)
             
             # Remove the match's impact from player statistics and revert ELO
             update = {
@@ -310,10 +337,10 @@ async def delete_match(match_id: str, current_user: UserInDB = Depends(get_curre
                     "total_goals_scored": -goals_scored,
                     "total_goals_conceded": -goals_conceded,
                     "goal_difference": -(goals_scored - goals_conceded),
-                    "wins": -result["win"],
-                    "losses": -result["loss"],
-                    "draws": -result["draw"],
-                    "points": -((result["win"] * 3) + (result["draw"] * 1)),
+                    "wins": -wins,
+                    "losses": -losses,
+                    "draws": -draws,
+                    "points": -points,
                 },
                 "$set": {
                     "elo_rating": reverted_elo
@@ -327,7 +354,10 @@ async def delete_match(match_id: str, current_user: UserInDB = Depends(get_curre
             )
             
             # Get updated player to ensure no negative values
-            updated_player = await db.users.find_one({"_id": ObjectId(player_id)})
+            updated_player = await db.users.find_one(
+                {"_id": ObjectId(player_id)},
+                {"total_matches": 1, "total_goals_scored": 1, "total_goals_conceded": 1, "wins": 1, "losses": 1, "draws": 1, "points": 1},
+            )
             if updated_player:
                 # Ensure no negative values
                 safety_update = {}
@@ -358,15 +388,16 @@ async def delete_match(match_id: str, current_user: UserInDB = Depends(get_curre
                     )
 
         # Delete the match
-        delete_result = await db.matches.delete_one({"_id": ObjectId(match_id)})
+        delete_result = await db.matches.delete_one({"_id": match_oid})
+        invalidate_player_stats(match["player1_id"], match["player2_id"])
         if delete_result.deleted_count == 0:
             raise HTTPException(status_code=400, detail="Match deletion failed")
 
-        logger.info(f"Successfully deleted match {match_id} and updated statistics")
+        logger.info("Successfully deleted match %s and updated statistics", match_id)
         return {"message": "Match deleted successfully"}
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error deleting match {match_id}: {str(e)}")
-        if "Invalid ObjectId" in str(e):
-            raise HTTPException(status_code=400, detail="Invalid ID format")
+        logger.error("Error deleting match %s: %s", match_id, e)
         raise HTTPException(status_code=400, detail=f"Match deletion failed: {str(e)}")
\ No newline at end of file
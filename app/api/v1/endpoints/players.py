@@ -1,28 +1,59 @@
 from typing import List
 from fastapi import APIRouter, HTTPException, Depends
 from bson import ObjectId
-from itertools import groupby
 from datetime import datetime
+import asyncio
+import itertools
 
 from app.models import Player, PlayerDetailedStats, Match, UserStatsWithMatches, RecentMatch
 from app.models.auth import UserInDB, UserCreate, UserUpdate, UserDetailedStats
-from app.api.dependencies import db
-from app.utils.helpers import match_helper
-from app.utils.auth import get_current_active_user, user_helper, get_password_hash
+from app.api.dependencies import db, parse_player_id
+from app.utils.helpers import match_helpers_batch, matches_with_players_pipeline
+from app.utils.caches import player_name_cache, stats_cache
+from app.utils.auth import get_current_active_user, user_helper, get_password_hash, USER_RESPONSE_PROJECTION
 
 router = APIRouter()
 
+
+def _winrate_over_time_pipeline(player_filter: dict, player_id: str) -> List[dict]:
+    """Aggregation yielding {"date", "winrate"} per match day, with the winrate cumulative up to that day"""
+    won = {
+        "$or": [
+            {"$and": [{"$eq": ["$player1_id", player_id]}, {"$gt": ["$player1_goals", "$player2_goals"]}]},
+            {"$and": [{"$eq": ["$player2_id", player_id]}, {"$gt": ["$player2_goals", "$player1_goals"]}]},
+        ]
+    }
+    running_total = {"documents": ["unbounded", "current"]}
+    return [
+        {"$match": player_filter},
+        {"$project": {
+            "won": {"$cond": [won, 1, 0]},
+            # Legacy documents may store the date as an ISO string
+            "day": {"$dateTrunc": {"date": {"$toDate": "$date"}, "unit": "day"}},
+        }},
+        {"$group": {"_id": "$day", "matches": {"$sum": 1}, "wins": {"$sum": "$won"}}},
+        {"$setWindowFields": {
+            "sortBy": {"_id": 1},
+            "output": {
+                "total_wins": {"$sum": "$wins", "window": running_total},
+                "total_matches": {"$sum": "$matches", "window": running_total},
+            },
+        }},
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "date": "$_id", "winrate": {"$divide": ["$total_wins", "$total_matches"]}}},
+    ]
+
 @router.post("/", response_model=Player)
 async def register_player(player: UserCreate, current_user: UserInDB = Depends(get_current_active_user)):
     """Register a new player (user)"""
-    existing_player = await db.users.find_one({"username": player.username})
+    existing_player = await db.users.find_one({"username": player.username}, {"_id": 1})
     if existing_player:
         raise HTTPException(
             status_code=400, detail="A player with this username already exists"
         )
 
     # Check if email already exists
-    existing_email = await db.users.find_one({"email": player.email})
+    existing_email = await db.users.find_one({"email": player.email}, {"_id": 1})
     if existing_email:
         raise HTTPException(
             status_code=400, detail="Email already registered"
@@ -62,22 +93,24 @@ async def register_player(player: UserCreate, current_user: UserInDB = Depends(g
     del player_data["password"]
     
     new_player = await db.users.insert_one(player_data)
-    created_player = await db.users.find_one({"_id": new_player.inserted_id})
-    return user_helper(created_player)
+    return user_helper({**player_data, "_id": new_player.inserted_id})
 
 
 @router.get("/", response_model=List[Player])
 async def get_players(current_user: UserInDB = Depends(get_current_active_user)):
     """Get all active players (excluding deleted ones)"""
-    players = await db.users.find({"is_deleted": {"$ne": True}}).to_list(1000)
-    return [user_helper(player) for player in players]
+    return await db.users.aggregate([
+        {"$match": {"is_deleted": {"$ne": True}}},
+        {"$limit": 1000},
+        USER_RESPONSE_PROJECTION,
+    ]).to_list(1000)
 
 
 @router.get("/{player_id}", response_model=UserStatsWithMatches)
-async def get_player(player_id: str, current_user: UserInDB = Depends(get_current_active_user)):
+async def get_player(player_id: str, player_oid: ObjectId = Depends(parse_player_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Get a specific player by ID with their last 5 matches (including deleted players)"""
     try:
-        player = await db.users.find_one({"_id": ObjectId(player_id)})
+        player = await db.users.find_one({"_id": player_oid})
         if not player:
             raise HTTPException(status_code=404, detail="Player not found")
         
@@ -95,13 +128,13 @@ async def get_player(player_id: str, current_user: UserInDB = Depends(get_curren
             # Get tournament name if available
             tournament_name = None
             if match.get("tournament_id"):
-                tournament = await db.tournaments.find_one({"_id": ObjectId(match["tournament_id"])})
+                tournament = await db.tournaments.find_one({"_id": ObjectId(match["tournament_id"])}, {"name": 1})
                 if tournament:
                     tournament_name = tournament.get("name")
             
         # Get opponent information
         opponent_id = match["player2_id"] if match["player1_id"] == player_id else match["player1_id"]
-        opponent = await db.users.find_one({"_id": ObjectId(opponent_id)})
+        opponent = await db.users.find_one({"_id": ObjectId(opponent_id)}, {"username": 1, "first_name": 1, "last_name": 1})
         
         # Determine current player's goals and opponent's goals
         current_player_goals = match["player1_goals"] if match["player1_id"] == player_id else match["player2_goals"]
@@ -156,17 +189,17 @@ async def get_player(player_id: str, current_user: UserInDB = Depends(get_curren
         
         return user_stats
         
+    except HTTPException:
+        raise
     except Exception as e:
-        if "Invalid ObjectId" in str(e):
-            raise HTTPException(status_code=400, detail="Invalid player ID format")
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{player_id}", response_model=Player)
-async def update_player(player_id: str, player: UserUpdate, current_user: UserInDB = Depends(get_current_active_user)):
+async def update_player(player_id: str, player: UserUpdate, player_oid: ObjectId = Depends(parse_player_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Update a player's information (partial update - only provided fields will be updated)"""
     # Check if player exists
-    existing_player = await db.users.find_one({"_id": ObjectId(player_id)})
+    existing_player = await db.users.find_one({"_id": player_oid}, {"is_deleted": 1, "username": 1, "email": 1})
     if not existing_player:
         raise HTTPException(status_code=404, detail="Player not found")
     
@@ -176,13 +209,13 @@ async def update_player(player_id: str, player: UserUpdate, current_user: UserIn
 
     # Check if new username already exists (if different from current)
     if player.username is not None and player.username != existing_player.get("username"):
-        existing_username = await db.users.find_one({"username": player.username})
+        existing_username = await db.users.find_one({"username": player.username}, {"_id": 1})
         if existing_username:
             raise HTTPException(status_code=400, detail="Username already exists")
 
     # Check if new email already exists (if different from current)
     if player.email is not None and player.email != existing_player.get("email"):
-        existing_email = await db.users.find_one({"email": player.email})
+        existing_email = await db.users.find_one({"email": player.email}, {"_id": 1})
         if existing_email:
             raise HTTPException(status_code=400, detail="Email already exists")
 
@@ -204,65 +237,98 @@ async def update_player(player_id: str, player: UserUpdate, current_user: UserIn
     update_data["updated_at"] = datetime.utcnow()
     
     update_result = await db.users.update_one(
-        {"_id": ObjectId(player_id)},
+        {"_id": player_oid},
         {"$set": update_data}
     )
+    # Usernames appear in other players' cached stats too
+    player_name_cache.pop(str(player_oid))
+    stats_cache.clear()
 
     if update_result.modified_count == 0:
         raise HTTPException(status_code=400, detail="Player update failed")
 
     # Get updated player
-    updated_player = await db.users.find_one({"_id": ObjectId(player_id)})
+    updated_player = await db.users.find_one({"_id": player_oid})
     return user_helper(updated_player)
 
 
 @router.delete("/{player_id}", response_model=dict)
-async def delete_player(player_id: str, current_user: UserInDB = Depends(get_current_active_user)):
+async def delete_player(player_id: str, player_oid: ObjectId = Depends(parse_player_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Mark a player as deleted instead of actually deleting them"""
-    try:
-        # Check if player exists
-        player = await db.users.find_one({"_id": ObjectId(player_id)})
-        
-        if not player:
-            raise HTTPException(status_code=404, detail="Player not found")
+    # Mark player as deleted instead of actually deleting
+    update_data = {
+        "is_active": False,
+        "is_deleted": True,
+        "deleted_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
 
-        # Mark player as deleted instead of actually deleting
-        update_data = {
-            "is_active": False,
-            "is_deleted": True,
-            "deleted_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        }
-        
-        update_result = await db.users.update_one(
-            {"_id": ObjectId(player_id)},
-            {"$set": update_data}
-        )
-        
-        if update_result.modified_count == 0:
-            raise HTTPException(status_code=400, detail="Player deletion failed")
+    update_result = await db.users.update_one(
+        {"_id": player_oid},
+        {"$set": update_data}
+    )
+    # No separate existence check: an unknown id matches nothing
+    if update_result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Player not found")
+    player_name_cache.pop(str(player_oid))
+    stats_cache.clear()
 
-        return {"message": "Player marked as deleted successfully"}
-    except Exception as e:
-        if "Invalid ObjectId" in str(e):
-            raise HTTPException(status_code=400, detail="Invalid player ID format")
-        raise
+    if update_result.modified_count == 0:
+        raise HTTPException(status_code=400, detail="Player deletion failed")
+
+    return {"message": "Player marked as deleted successfully"}
 
 
 @router.get("/{player_id}/stats", response_model=UserDetailedStats)
-async def get_player_detailed_stats(player_id: str, current_user: UserInDB = Depends(get_current_active_user)):
+async def get_player_detailed_stats(player_id: str, player_oid: ObjectId = Depends(parse_player_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Get detailed statistics for a specific player with their last 5 matches (including deleted players)"""
-    player : Player = await db.users.find_one({"_id": ObjectId(player_id)})
+    # Canonical hex form, so the cache key and the stored-id queries agree for any input casing
+    player_id = str(player_oid)
+    cache_key = ("detailed", player_id)
+    cached_stats = stats_cache.get(cache_key)
+    if cached_stats is not None:
+        return cached_stats
+    
+    player : Player = await db.users.find_one({"_id": player_oid})
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     
-    # Get all matches for this player
-    matches: List[Match] = await db.matches.find({
+    # Get all matches for this player, plus the last 5 for the recent matches list
+    player_filter = {
         "$or": [
             {"player1_id": player_id},
             {"player2_id": player_id}
         ]
-    }).sort("date", 1).to_list(1000)
+    }
+    matches: List[Match]
+    matches, user_matches, daily_winrate = await asyncio.gather(
+        db.matches.find(
+            player_filter,
+            {"player1_id": 1, "player2_id": 1, "player1_goals": 1, "player2_goals": 1},
+        ).to_list(1000),
+        db.matches.find(player_filter).sort("date", -1).limit(5).to_list(5),
+        # Cumulative winrate at the end of each day, computed on the server
+        db.matches.aggregate(_winrate_over_time_pipeline(player_filter, player_id)).to_list(None),
+    )
+
+    # Resolve every opponent and recent-match tournament with one $in query each
+    opponent_ids = {
+        match["player2_id"] if match["player1_id"] == player_id else match["player1_id"]
+        for match in itertools.chain(matches, user_matches)
+    }
+    tournament_ids = {match["tournament_id"] for match in user_matches if match.get("tournament_id")}
+    opponents, recent_tournaments = await asyncio.gather(
+        db.users.find(
+            {"_id": {"$in": [ObjectId(i) for i in opponent_ids if ObjectId.is_valid(i)]}},
+            {"username": 1, "first_name": 1, "last_name": 1},
+        ).to_list(None),
+        db.tournaments.find(
+            {"_id": {"$in": [ObjectId(i) for i in tournament_ids if ObjectId.is_valid(i)]}},
+            {"name": 1},
+        ).to_list(None),
+    )
+    opponents_by_id = {str(opponent["_id"]): opponent for opponent in opponents}
+    tournament_names = {str(tournament["_id"]): tournament.get("name") for tournament in recent_tournaments}
 
     wins_against = {}
     losses_against = {}
@@ -273,7 +339,9 @@ async def get_player_detailed_stats(player_id: str, current_user: UserInDB = Dep
             if match["player1_id"] == player_id
             else match["player1_id"]
         )
-        opponent : Player = await db.users.find_one({"_id": ObjectId(opponent_id)})
+        opponent : Player = opponents_by_id.get(str(opponent_id))
+        if not opponent:
+            continue
 
         if match["player1_id"] == player_id:
             if match["player1_goals"] > match["player2_goals"]:
@@ -301,37 +369,6 @@ async def get_player_detailed_stats(player_id: str, current_user: UserInDB = Dep
         max(losses_against.items(), key=lambda x: x[1]) if losses_against else None
     )
 
-    # Calculate winrate over time (per day)
-    total_matches = 0
-    total_wins = 0
-    daily_winrate = []
-
-    # Convert match dates to datetime objects if they're strings
-    for match in matches:
-        if isinstance(match["date"], str):
-            match["date"] = datetime.fromisoformat(match["date"])
-
-    # Group matches by date
-    for date, day_matches in groupby(matches, key=lambda x: x["date"].date()):
-        day_matches = list(day_matches)
-        for match in day_matches:
-            total_matches += 1
-            is_player1 = match["player1_id"] == player_id
-            player_goals = (
-                match["player1_goals"] if is_player1 else match["player2_goals"]
-            )
-            opponent_goals = (
-                match["player2_goals"] if is_player1 else match["player1_goals"]
-            )
-
-            if player_goals > opponent_goals:
-                total_wins += 1
-
-        winrate = total_wins / total_matches if total_matches > 0 else 0
-        # Convert date to datetime at midnight
-        date_dt = datetime.combine(date, datetime.min.time())
-        daily_winrate.append({"date": date_dt, "winrate": winrate})
-
     # Calculate tournament participation
     tournaments_played = 0
     tournament_ids = []
@@ -339,7 +376,7 @@ async def get_player_detailed_stats(player_id: str, current_user: UserInDB = Dep
     # Find all tournaments where this player is a participant
     tournaments = await db.tournaments.find({
         "player_ids": {"$in": [player_id]}
-    }).to_list(1000)
+    }, {"_id": 1}).to_list(1000)
     
     tournaments_played = len(tournaments)
     tournament_ids = [str(t["_id"]) for t in tournaments]
@@ -374,27 +411,17 @@ async def get_player_detailed_stats(player_id: str, current_user: UserInDB = Dep
         }
     )
 
-    # Get player's last 5 matches
-    user_matches = await db.matches.find({
-        "$or": [
-            {"player1_id": player_id},
-            {"player2_id": player_id}
-        ]
-    }).sort("date", -1).limit(5).to_list(5)
-    
-    # Convert matches to RecentMatch format
+    # Convert the last 5 matches to RecentMatch format
     recent_matches = []
     for match in user_matches:
         # Get tournament name if available
         tournament_name = None
         if match.get("tournament_id"):
-            tournament = await db.tournaments.find_one({"_id": ObjectId(match["tournament_id"])})
-            if tournament:
-                tournament_name = tournament.get("name")
+            tournament_name = tournament_names.get(str(match["tournament_id"]))
         
         # Get opponent information
         opponent_id = match["player2_id"] if match["player1_id"] == player_id else match["player1_id"]
-        opponent = await db.users.find_one({"_id": ObjectId(opponent_id)})
+        opponent = opponents_by_id.get(str(opponent_id))
         
         # Determine current player's goals and opponent's goals
         current_player_goals = match["player1_goals"] if match["player1_id"] == player_id else match["player2_goals"]
@@ -431,30 +458,26 @@ async def get_player_detailed_stats(player_id: str, current_user: UserInDB = Dep
     stats["last_5_matches"] = recent_matches
     
     # Return the detailed stats with calculated averages
+    stats_cache.set(cache_key, stats)
     return stats
 
 
 @router.get("/{player_id}/matches")
-async def get_player_matches(player_id: str, current_user: UserInDB = Depends(get_current_active_user)):
+async def get_player_matches(player_id: str, player_oid: ObjectId = Depends(parse_player_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Get all matches for a specific player (including deleted players)"""
     
     # Get player info
-    player : Player = await db.users.find_one({"_id": ObjectId(player_id)})
+    player : Player = await db.users.find_one({"_id": player_oid}, {"_id": 1})
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     
-    matches = (
-        await db.matches.find(
-            {"$or": [{"player1_id": player_id}, {"player2_id": player_id}]}
+    matches = await db.matches.aggregate(
+        matches_with_players_pipeline(
+            {"$or": [{"player1_id": player_id}, {"player2_id": player_id}]},
+            sort={"date": -1},
+            limit=1000,
         )
-        .sort("date", -1)
-        .to_list(1000)
-    )
+    ).to_list(None)
 
     # Return matches with player names
-    matches_with_names = []
-    for match in matches:
-        match_data = await match_helper(match, db)
-        matches_with_names.append(match_data)
-
-    return matches_with_names
+    return await match_helpers_batch(matches, db)
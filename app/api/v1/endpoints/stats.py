@@ -1,20 +1,27 @@
 from typing import List, Union
 from fastapi import APIRouter, HTTPException, Depends
 from bson import ObjectId
+import asyncio
 
 from app.models import Player, HeadToHeadStats, RecentMatch, UserStatsWithMatches
 from app.models.auth import UserInDB
-from app.api.dependencies import get_database
+from app.api.dependencies import get_database, parse_object_id
 
 from app.utils.auth import user_helper
 from app.utils.auth import get_current_active_user
 from app.utils.helpers import calculate_head_to_head_stats
+from app.utils.caches import stats_cache
 
 router = APIRouter()
 
 @router.get("/", response_model=UserStatsWithMatches)
 async def get_stats(current_user: UserInDB = Depends(get_current_active_user)):
     """Get current user's stats along with their last 5 matches"""
+    cache_key = ("summary", str(current_user.id))
+    cached_stats = stats_cache.get(cache_key)
+    if cached_stats is not None:
+        return cached_stats
+    
     db = await get_database()
     
     # Get user's last 5 matches
@@ -31,13 +38,13 @@ async def get_stats(current_user: UserInDB = Depends(get_current_active_user)):
         # Get tournament name if available
         tournament_name = None
         if match.get("tournament_id"):
-            tournament = await db.tournaments.find_one({"_id": ObjectId(match["tournament_id"])})
+            tournament = await db.tournaments.find_one({"_id": ObjectId(match["tournament_id"])}, {"name": 1})
             if tournament:
                 tournament_name = tournament.get("name")
         
         # Get opponent information
         opponent_id = match["player2_id"] if match["player1_id"] == str(current_user.id) else match["player1_id"]
-        opponent = await db.users.find_one({"_id": ObjectId(opponent_id)})
+        opponent = await db.users.find_one({"_id": ObjectId(opponent_id)}, {"username": 1, "first_name": 1, "last_name": 1})
         
         # Determine current player's goals and opponent's goals
         current_player_goals = match["player1_goals"] if match["player1_id"] == str(current_user.id) else match["player2_goals"]
@@ -90,14 +97,19 @@ async def get_stats(current_user: UserInDB = Depends(get_current_active_user)):
         last_5_matches=recent_matches
     )
     
+    stats_cache.set(cache_key, user_stats)
     return user_stats
 
 @router.get("/head-to-head/{player1_id}/{player2_id}", response_model=HeadToHeadStats)
 async def get_head_to_head_stats(player1_id: str, player2_id: str):
     """Get head-to-head statistics between two players"""
+    player1_oid = parse_object_id(player1_id, "Invalid player ID format")
+    player2_oid = parse_object_id(player2_id, "Invalid player ID format")
     db = await get_database()
-    player1 = await db.users.find_one({"_id": ObjectId(player1_id)})
-    player2 = await db.users.find_one({"_id": ObjectId(player2_id)})
+    player1, player2 = await asyncio.gather(
+        db.users.find_one({"_id": player1_oid}, {"username": 1}),
+        db.users.find_one({"_id": player2_oid}, {"username": 1}),
+    )
 
     if not player1 or not player2:
         raise HTTPException(status_code=404, detail="One or both players not found")
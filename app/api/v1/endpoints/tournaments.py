@@ -3,14 +3,14 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from bson import ObjectId
 from pydantic import BaseModel, Field
 from datetime import datetime
-import math
 import time
 
-from app.models import TournamentCreate, Tournament, Match, Player, TournamentPlayerStats, TournamentPlayer, PaginatedResponse, MatchUpdate
+from app.models import TournamentCreate, Tournament, Match, Player, TournamentPlayerStats, TournamentPlayer, PaginatedMatch, MatchUpdate
 from app.models.auth import UserInDB
-from app.api.dependencies import get_database
-from app.utils.helpers import match_helper, calculate_tournament_stats, generate_round_robin_matches, generate_missing_matches
+from app.api.dependencies import get_database, parse_match_id, parse_object_id, parse_tournament_id
+from app.utils.helpers import match_helper, match_helpers_batch, calculate_tournament_stats, calculate_all_tournament_stats, matches_with_players_pipeline, generate_round_robin_matches, generate_missing_matches
 from app.utils.auth import get_current_active_user
+from app.utils.caches import invalidate_player_stats, stats_cache
 from app.utils.logging import get_logger
 from app.config import settings
 
@@ -66,7 +66,7 @@ async def get_player_last_5_matches(db, player_id: str, tournament_id: str = Non
             query["tournament_id"] = tournament_id
         
         # Get matches sorted by date (most recent first)
-        matches_cursor = db.matches.find(query).sort("date", -1).limit(5)
+        matches_cursor = db.matches.find(query, {"player1_id": 1, "player2_id": 1, "player1_goals": 1, "player2_goals": 1}).sort("date", -1).limit(5)
         matches = await matches_cursor.to_list(5)
         
         # Convert matches to simple result characters
@@ -99,7 +99,7 @@ async def get_player_last_5_matches(db, player_id: str, tournament_id: str = Non
         return results
         
     except Exception as e:
-        logger.error(f"Error getting last 5 matches for player {player_id}: {e}")
+        logger.error("Error getting last 5 matches for player %s: %s", player_id, e)
         return ["-", "-", "-", "-", "-"]  # Return default if error
 
 class PlayerIdRequest(BaseModel):
@@ -128,7 +128,7 @@ async def create_tournament(tournament: TournamentCreate, current_user: UserInDB
                 raise HTTPException(status_code=400, detail="One or more player IDs are invalid")
                 
         except Exception as e:
-            logger.error(f"Error validating player IDs: {e}")
+            logger.error("Error validating player IDs: %s", e)
             raise HTTPException(status_code=400, detail="Invalid player ID format")
     
     # Convert to dict with default values
@@ -165,11 +165,12 @@ async def create_tournament(tournament: TournamentCreate, current_user: UserInDB
                     }
                 }
             )
+            tournament_dict.update(matches=match_ids, matches_count=len(match_ids))
             
-            logger.info(f"Created tournament {tournament_id} with {len(matches)} auto-generated matches")
+            logger.info("Created tournament %s with %s auto-generated matches", tournament_id, len(matches))
     
-    # Get the final tournament with all data
-    created_tournament = await db.tournaments.find_one({"_id": new_tournament.inserted_id})
+    # Build the final tournament from the inserted document instead of re-reading it
+    created_tournament = {**tournament_dict, "_id": new_tournament.inserted_id}
     return Tournament(**tournament_helper(created_tournament))
 
 @router.get("/", response_model=List[Tournament])
@@ -188,31 +189,32 @@ async def get_tournaments(current_user: UserInDB = Depends(get_current_active_us
         ]
     }).to_list(1000)
     
-    return [Tournament(**tournament_helper(t)) for t in tournaments]
+    return [tournament_helper(t) for t in tournaments]
 
-@router.get("/{tournament_id}/matches", response_model=PaginatedResponse[Match])
+@router.get("/{tournament_id}/matches", response_model=PaginatedMatch)
 async def get_tournament_matches(
     tournament_id: str, 
+    tournament_oid: ObjectId = Depends(parse_tournament_id),
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     page_size: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE, description="Number of items per page"),
     current_user: UserInDB = Depends(get_current_active_user)
 ):
     """Get all matches for a specific tournament with pagination"""
     start_time = time.time()
-    logger.info(f"Starting tournament matches request - tournament_id: {tournament_id}, page: {page}, page_size: {page_size}")
+    logger.info("Starting tournament matches request - tournament_id: %s, page: %s, page_size: %s", tournament_id, page, page_size)
     
     db = await get_database()
     db_time = time.time()
-    logger.info(f"Database connection established in {(db_time - start_time) * 1000:.2f}ms")
+    logger.info("Database connection established in %.2fms", (db_time - start_time) * 1000)
     
     # Validate tournament exists
     tournament_start = time.time()
-    tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    tournament = await db.tournaments.find_one({"_id": tournament_oid})
     tournament_time = time.time()
-    logger.info(f"Tournament validation query completed in {(tournament_time - tournament_start) * 1000:.2f}ms")
+    logger.info("Tournament validation query completed in %.2fms", (tournament_time - tournament_start) * 1000)
     
     if not tournament:
-        logger.warning(f"Tournament not found - tournament_id: {tournament_id}")
+        logger.warning("Tournament not found - tournament_id: %s", tournament_id)
         raise HTTPException(status_code=404, detail="Tournament not found")
     
     # Calculate skip value for pagination
@@ -222,114 +224,51 @@ async def get_tournament_matches(
     count_start = time.time()
     total_matches = await db.matches.count_documents({"tournament_id": tournament_id})
     count_time = time.time()
-    logger.info(f"Match count query completed in {(count_time - count_start) * 1000:.2f}ms - total_matches: {total_matches}")
+    logger.info("Match count query completed in %.2fms - total_matches: %s", (count_time - count_start) * 1000, total_matches)
     
     # Get paginated matches
     matches_start = time.time()
-    matches_cursor = db.matches.find({"tournament_id": tournament_id}).sort("date", -1).skip(skip).limit(page_size)
-    matches = await matches_cursor.to_list(page_size)
+    matches = await db.matches.aggregate(
+        matches_with_players_pipeline(
+            {"tournament_id": tournament_id},
+            sort={"date": -1},
+            skip=skip,
+            limit=page_size,
+            include_tournament=False,
+        )
+    ).to_list(page_size)
     matches_time = time.time()
-    logger.info(f"Matches fetch query completed in {(matches_time - matches_start) * 1000:.2f}ms - fetched_matches: {len(matches)}")
-    
-    # Fetch all unique player IDs from the matches
-    player_ids_start = time.time()
-    unique_player_ids = set()
-    for match in matches:
-        if match.get("player1_id"):
-            unique_player_ids.add(match["player1_id"])
-        if match.get("player2_id"):
-            unique_player_ids.add(match["player2_id"])
-    
-    # Fetch all players in one query
-    players = {}
-    if unique_player_ids:
-        player_objects = await db.users.find({"_id": {"$in": [ObjectId(pid) for pid in unique_player_ids]}}).to_list(len(unique_player_ids))
-        players = {str(player["_id"]): player for player in player_objects}
-    
-    player_ids_time = time.time()
-    logger.info(f"Player data fetch completed in {(player_ids_time - player_ids_start) * 1000:.2f}ms - unique_players: {len(players)}")
-    
-    # Process matches with helper function using pre-fetched data
-    processing_start = time.time()
-    processed_matches = []
-    for match in matches:
-        # Create a simplified match_helper that uses pre-fetched data
-        match_id = str(match.get("_id", "unknown"))
-        
-        # Get player information from pre-fetched data
-        player1_id = match.get("player1_id")
-        player2_id = match.get("player2_id")
-        
-        if not player1_id or not player2_id:
-            player1_name = "Unknown Player"
-            player2_name = "Unknown Player"
-        else:
-            player1 = players.get(player1_id)
-            player2 = players.get(player2_id)
-            
-            # Handle deleted players
-            if player1 and player1.get("is_deleted", False):
-                player1_name = "Deleted Player"
-            else:
-                player1_name = player1["username"] if player1 else "Unknown Player"
-                
-            if player2 and player2.get("is_deleted", False):
-                player2_name = "Deleted Player"
-            else:
-                player2_name = player2["username"] if player2 else "Unknown Player"
-        
-        processed_match = {
-            "id": str(match["_id"]),
-            "player1_name": player1_name,
-            "player2_name": player2_name,
-            "player1_goals": match.get("player1_goals", 0),
-            "player2_goals": match.get("player2_goals", 0),
-            "date": match.get("date", datetime.now()),
-            "team1": match.get("team1", "Unknown"),
-            "team2": match.get("team2", "Unknown"),
-            "half_length": match.get("half_length", 4),
-            "tournament_name": tournament["name"] if tournament else None
-        }
-        
-        processed_matches.append(Match(**processed_match))
+    logger.info("Matches fetch query completed in %.2fms - fetched_matches: %s", (matches_time - matches_start) * 1000, len(matches))
     
+    # Process matches with player names joined by the pipeline, reusing the tournament loaded above.
+    # Rows stay plain dicts; FastAPI validates and serializes the page once against response_model.
+    processing_start = time.time()
+    tournaments_cache = {str(tournament["_id"]): tournament}
+    processed_matches = await match_helpers_batch(matches, db, tournaments_cache)
     processing_time = time.time()
-    logger.info(f"Match processing completed in {(processing_time - processing_start) * 1000:.2f}ms - processed_matches: {len(processed_matches)}")
-    
-    # Calculate pagination metadata
-    total_pages = math.ceil(total_matches / page_size) if total_matches > 0 else 0
-    has_next = page < total_pages
-    has_previous = page > 1
+    logger.info("Match processing completed in %.2fms - processed_matches: %s", (processing_time - processing_start) * 1000, len(processed_matches))
     
     total_time = time.time()
-    logger.info(f"Tournament matches request completed in {(total_time - start_time) * 1000:.2f}ms - tournament_id: {tournament_id}, page: {page}, total_matches: {total_matches}, returned_matches: {len(processed_matches)}")
-    
-    return PaginatedResponse[Match](
-        items=processed_matches,
-        total=total_matches,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-        has_next=has_next,
-        has_previous=has_previous
-    )
+    logger.info("Tournament matches request completed in %.2fms - tournament_id: %s, page: %s, total_matches: %s, returned_matches: %s", (total_time - start_time) * 1000, tournament_id, page, total_matches, len(processed_matches))
+    
+    return {"items": processed_matches, "total": total_matches, "page": page, "page_size": page_size}
 
 @router.get("/{tournament_id}/", response_model=Tournament)
-async def get_tournament(tournament_id: str, current_user: UserInDB = Depends(get_current_active_user)):
+async def get_tournament(tournament_id: str, tournament_oid: ObjectId = Depends(parse_tournament_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Get a specific tournament"""
     db = await get_database()
-    tournament : Tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    tournament : Tournament = await db.tournaments.find_one({"_id": tournament_oid})
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     return Tournament(**tournament_helper(tournament))
 
 @router.put("/{tournament_id}/", response_model=Tournament)
-async def update_tournament(tournament_id: str, tournament_update: TournamentUpdate, current_user: UserInDB = Depends(get_current_active_user)):
+async def update_tournament(tournament_id: str, tournament_update: TournamentUpdate, tournament_oid: ObjectId = Depends(parse_tournament_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Update tournament details"""
     db = await get_database()
     
     # Check if tournament exists
-    tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    tournament = await db.tournaments.find_one({"_id": tournament_oid})
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     
@@ -354,7 +293,7 @@ async def update_tournament(tournament_id: str, tournament_update: TournamentUpd
     
     # Update the tournament
     await db.tournaments.update_one(
-        {"_id": ObjectId(tournament_id)}, 
+        {"_id": tournament_oid}, 
         {"$set": update_data}
     )
     
@@ -364,7 +303,7 @@ async def update_tournament(tournament_id: str, tournament_update: TournamentUpd
         # Delete all existing matches for this tournament
         if tournament.get("matches"):
             await db.matches.delete_many({"tournament_id": tournament_id})
-            logger.info(f"Deleted existing matches for tournament {tournament_id}")
+            logger.info("Deleted existing matches for tournament %s", tournament_id)
         
         # Generate new round-robin matches
         new_rounds_per_matchup = update_data.get("rounds_per_matchup", tournament.get("rounds_per_matchup", 2))
@@ -379,11 +318,11 @@ async def update_tournament(tournament_id: str, tournament_update: TournamentUpd
             # Insert all new matches
             inserted_matches = await db.matches.insert_many(new_matches)
             match_ids = [str(match_id) for match_id in inserted_matches.inserted_ids]
-            logger.info(f"Generated {len(new_matches)} new matches for tournament {tournament_id}")
+            logger.info("Generated %s new matches for tournament %s", len(new_matches), tournament_id)
         
         # Update tournament with new matches
         await db.tournaments.update_one(
-            {"_id": ObjectId(tournament_id)}, 
+            {"_id": tournament_oid}, 
             {
                 "$set": {
                     "matches": match_ids,
@@ -391,18 +330,19 @@ async def update_tournament(tournament_id: str, tournament_update: TournamentUpd
                 }
             }
         )
+        invalidate_player_stats(*tournament["player_ids"])
     
     # Return the updated tournament
-    updated_tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    updated_tournament = await db.tournaments.find_one({"_id": tournament_oid})
     return Tournament(**tournament_helper(updated_tournament))
 
 @router.delete("/{tournament_id}/", response_model=dict)
-async def delete_tournament(tournament_id: str, current_user: UserInDB = Depends(get_current_active_user)):
+async def delete_tournament(tournament_id: str, tournament_oid: ObjectId = Depends(parse_tournament_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Delete a tournament and all its associated matches"""
     db = await get_database()
     
     # Check if tournament exists
-    tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    tournament = await db.tournaments.find_one({"_id": tournament_oid})
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     
@@ -418,22 +358,24 @@ async def delete_tournament(tournament_id: str, current_user: UserInDB = Depends
     
     # Delete all matches associated with this tournament
     matches_deleted = await db.matches.delete_many({"tournament_id": tournament_id})
-    logger.info(f"Deleted {matches_deleted.deleted_count} matches for tournament {tournament_id}")
+    logger.info("Deleted %s matches for tournament %s", matches_deleted.deleted_count, tournament_id)
+    # Deleted matches may involve players who have since left the tournament
+    stats_cache.clear()
     
     # Delete the tournament
-    await db.tournaments.delete_one({"_id": ObjectId(tournament_id)})
-    logger.info(f"Deleted tournament {tournament_id} by user {current_user_id}")
+    await db.tournaments.delete_one({"_id": tournament_oid})
+    logger.info("Deleted tournament %s by user %s", tournament_id, current_user_id)
     
     return {"message": "Tournament and all associated matches deleted successfully"}
 
 @router.post("/{tournament_id}/players", response_model=Tournament)
-async def add_player_to_tournament(tournament_id: str, player_request: PlayerIdRequest, current_user: UserInDB = Depends(get_current_active_user)):
+async def add_player_to_tournament(tournament_id: str, player_request: PlayerIdRequest, tournament_oid: ObjectId = Depends(parse_tournament_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Add a player to a tournament and generate missing matches while preserving completed ones"""
     db = await get_database()
-    logger.info(f"Adding player {player_request.player_id} to tournament {tournament_id}")
+    logger.info("Adding player %s to tournament %s", player_request.player_id, tournament_id)
     
     # Validate tournament exists
-    tournament : Tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    tournament : Tournament = await db.tournaments.find_one({"_id": tournament_oid})
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     
@@ -442,12 +384,9 @@ async def add_player_to_tournament(tournament_id: str, player_request: PlayerIdR
         raise HTTPException(status_code=400, detail="Cannot add players to a completed tournament")
     
     # Validate player exists
-    try:
-        player = await db.users.find_one({"_id": ObjectId(player_request.player_id)})
-        if not player:
-            raise HTTPException(status_code=404, detail="Player not found")
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid player ID format")
+    player = await db.users.find_one({"_id": parse_object_id(player_request.player_id, "Invalid player ID format")})
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
     
     # Initialize player_ids if it doesn't exist
     if "player_ids" not in tournament:
@@ -487,15 +426,16 @@ async def add_player_to_tournament(tournament_id: str, player_request: PlayerIdR
             existing_match_ids = [str(match["_id"]) for match in existing_matches]
             match_ids = existing_match_ids + new_match_ids
             
-            logger.info(f"Generated {len(new_matches)} new matches for tournament {tournament_id}. Total matches: {len(match_ids)}")
+            logger.info("Generated %s new matches for tournament %s. Total matches: %s", len(new_matches), tournament_id, len(match_ids))
+            invalidate_player_stats(*tournament["player_ids"])
         else:
             # No new matches needed, just keep existing ones
             match_ids = [str(match["_id"]) for match in existing_matches]
-            logger.info(f"No new matches needed for tournament {tournament_id}. Keeping {len(match_ids)} existing matches.")
+            logger.info("No new matches needed for tournament %s. Keeping %s existing matches.", tournament_id, len(match_ids))
     
     # Update tournament with new player and updated match list
     await db.tournaments.update_one(
-        {"_id": ObjectId(tournament_id)}, 
+        {"_id": tournament_oid}, 
         {
             "$set": {
                 "player_ids": tournament["player_ids"],
@@ -506,14 +446,14 @@ async def add_player_to_tournament(tournament_id: str, player_request: PlayerIdR
     )
     
     # Get updated tournament
-    updated_tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    updated_tournament = await db.tournaments.find_one({"_id": tournament_oid})
     return Tournament(**tournament_helper(updated_tournament))
 
 @router.get("/{tournament_id}/players", response_model=List[TournamentPlayer])
-async def get_tournament_players(tournament_id: str, current_user: UserInDB = Depends(get_current_active_user)):
+async def get_tournament_players(tournament_id: str, tournament_oid: ObjectId = Depends(parse_tournament_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Get all players in a tournament"""
     db = await get_database()
-    tournament : Tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    tournament : Tournament = await db.tournaments.find_one({"_id": tournament_oid})
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     
@@ -539,14 +479,14 @@ async def get_tournament_players(tournament_id: str, current_user: UserInDB = De
         
         return result
     except Exception as e:
-        logger.error(f"Error fetching tournament players: {e}")
+        logger.error("Error fetching tournament players: %s", e)
         raise HTTPException(status_code=500, detail="Error fetching tournament players")
 
 @router.delete("/{tournament_id}/players/{player_id}", response_model=Tournament)
-async def remove_player_from_tournament(tournament_id: str, player_id: str, current_user: UserInDB = Depends(get_current_active_user)):
+async def remove_player_from_tournament(tournament_id: str, player_id: str, tournament_oid: ObjectId = Depends(parse_tournament_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Remove a player from a tournament and regenerate matches while preserving completed ones"""
     db = await get_database()
-    tournament : Tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    tournament : Tournament = await db.tournaments.find_one({"_id": tournament_oid})
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     
@@ -589,7 +529,8 @@ async def remove_player_from_tournament(tournament_id: str, player_id: str, curr
     if matches_to_remove:
         match_ids_to_remove = [match["_id"] for match in matches_to_remove]
         await db.matches.delete_many({"_id": {"$in": match_ids_to_remove}})
-        logger.info(f"Deleted {len(matches_to_remove)} matches involving removed player {player_id_str} from tournament {tournament_id}")
+        logger.info("Deleted %s matches involving removed player %s from tournament %s", len(matches_to_remove), player_id_str, tournament_id)
+        invalidate_player_stats(player_id_str, *tournament["player_ids"])
     
     # Generate missing matches for the remaining players (if needed)
     new_matches = []
@@ -614,19 +555,20 @@ async def remove_player_from_tournament(tournament_id: str, player_id: str, curr
             kept_match_ids = [str(match["_id"]) for match in matches_to_keep]
             match_ids = kept_match_ids + new_match_ids
             
-            logger.info(f"Generated {len(new_matches)} new matches after removing player {player_id_str}. Total matches: {len(match_ids)}")
+            logger.info("Generated %s new matches after removing player %s. Total matches: %s", len(new_matches), player_id_str, len(match_ids))
+            invalidate_player_stats(*tournament["player_ids"])
         else:
             # No new matches needed, just keep existing valid ones
             match_ids = [str(match["_id"]) for match in matches_to_keep]
-            logger.info(f"No new matches needed after removing player {player_id_str}. Keeping {len(match_ids)} existing matches.")
+            logger.info("No new matches needed after removing player %s. Keeping %s existing matches.", player_id_str, len(match_ids))
     else:
         # Less than 2 players remaining, no matches possible
         match_ids = []
-        logger.info(f"Less than 2 players remaining in tournament {tournament_id} after removing player {player_id_str}")
+        logger.info("Less than 2 players remaining in tournament %s after removing player %s", tournament_id, player_id_str)
     
     # Update tournament with remaining players and updated matches
     await db.tournaments.update_one(
-        {"_id": ObjectId(tournament_id)}, 
+        {"_id": tournament_oid}, 
         {
             "$set": {
                 "player_ids": tournament["player_ids"],
@@ -637,21 +579,19 @@ async def remove_player_from_tournament(tournament_id: str, player_id: str, curr
     )
     
     # Get updated tournament
-    updated_tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    updated_tournament = await db.tournaments.find_one({"_id": tournament_oid})
     return Tournament(**tournament_helper(updated_tournament))
 
 @router.get("/{tournament_id}/stats", response_model=List[TournamentPlayerStats])
-async def get_tournament_stats(tournament_id: str, current_user: UserInDB = Depends(get_current_active_user)):
+async def get_tournament_stats(tournament_id: str, tournament_oid: ObjectId = Depends(parse_tournament_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Get tournament stats"""
     db = await get_database()
-    tournament : Tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
-    logger.info(f"Tournament: {tournament} \n")
+    tournament : Tournament = await db.tournaments.find_one({"_id": tournament_oid})
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     
     # Handle player_ids - they might be stored as strings or ObjectIds
     player_ids = tournament.get("player_ids", [])
-    logger.info(f"Player IDs from tournament: {player_ids}")
     
     if not player_ids:
         logger.warning("No players found in tournament")
@@ -660,22 +600,22 @@ async def get_tournament_stats(tournament_id: str, current_user: UserInDB = Depe
     # Convert string IDs to ObjectIds for database query
     try:
         player_object_ids = [ObjectId(pid) if isinstance(pid, str) else pid for pid in player_ids]
-        players : List[Player] = await db.users.find({"_id": {"$in": player_object_ids}}).to_list(1000)
-        logger.info(f"Found {len(players)} players in database")
+        players : List[Player] = await db.users.find({"_id": {"$in": player_object_ids}}, {"username": 1, "first_name": 1, "last_name": 1}).to_list(1000)
+        logger.info("Found %s players in database", len(players))
     except Exception as e:
-        logger.error(f"Error converting player IDs: {e}")
+        logger.error("Error converting player IDs: %s", e)
         return []
     
     # Check if tournament has rounds_per_matchup field to determine if we should filter by completion
     if "rounds_per_matchup" in tournament:
         # New tournament format - only count completed matches
-        matches : List[Match] = await db.matches.find({"tournament_id": tournament_id, "completed": True}).to_list(1000)
-        logger.info(f"Found {len(matches)} completed matches for tournament (filtering by completion)")
+        matches : List[Match] = await db.matches.find({"tournament_id": tournament_id, "completed": True}, {"player1_id": 1, "player2_id": 1, "player1_goals": 1, "player2_goals": 1}).to_list(1000)
+        logger.info("Found %s completed matches for tournament (filtering by completion)", len(matches))
         no_matches_message = "No completed matches found for tournament, returning empty stats"
     else:
         # Legacy tournament format - count all matches
-        matches : List[Match] = await db.matches.find({"tournament_id": tournament_id}).to_list(1000)
-        logger.info(f"Found {len(matches)} matches for tournament (legacy format - no completion filter)")
+        matches : List[Match] = await db.matches.find({"tournament_id": tournament_id}, {"player1_id": 1, "player2_id": 1, "player1_goals": 1, "player2_goals": 1}).to_list(1000)
+        logger.info("Found %s matches for tournament (legacy format - no completion filter)", len(matches))
         no_matches_message = "No matches found for tournament, returning empty stats"
     
     if not players:
@@ -708,12 +648,12 @@ async def get_tournament_stats(tournament_id: str, current_user: UserInDB = Depe
             tournament_stats.append(player_stats)
         return tournament_stats
 
-    # Calculate tournament statistics for each player
+    # Calculate tournament statistics for all players in one pass over the matches
+    all_stats = calculate_all_tournament_stats(matches)
     tournament_stats = []
     for player in players:
         player_id = str(player["_id"])
-        logger.info(f"Calculating stats for player {player['username']} (ID: {player_id})")
-        stats = calculate_tournament_stats(player_id, matches)
+        stats = all_stats.get(player_id) or calculate_tournament_stats(player_id, [])
         
         # Get last 5 matches for this player (filtered by tournament)
         last_5_matches = await get_player_last_5_matches(db, player_id, tournament_id)
@@ -736,32 +676,32 @@ async def get_tournament_stats(tournament_id: str, current_user: UserInDB = Depe
         )
         
         tournament_stats.append(player_stats)
-        logger.info(f"Player {player['username']} tournament stats: {stats}")
 
     # Sort by points in descending order (highest points first)
     tournament_stats.sort(key=lambda x: x.points, reverse=True)
+    logger.debug("Computed tournament stats for %s players", len(tournament_stats))
     
     return tournament_stats
 
 @router.post("/tournament/{tournament_id}/match", response_model=Tournament)
-async def add_match_to_tournament(tournament_id: str, match: Match, current_user: UserInDB = Depends(get_current_active_user)):
+async def add_match_to_tournament(tournament_id: str, match: Match, tournament_oid: ObjectId = Depends(parse_tournament_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Add a match to a tournament"""
     db = await get_database()
-    tournament : Tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    tournament : Tournament = await db.tournaments.find_one({"_id": tournament_oid})
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     await db.matches.insert_one(match.model_dump())
-    await db.tournaments.update_one({"_id": ObjectId(tournament_id)}, {"$set": {"matches_count": tournament["matches_count"] + 1}})
+    await db.tournaments.update_one({"_id": tournament_oid}, {"$set": {"matches_count": tournament["matches_count"] + 1}})
     tournament["matches_count"] = tournament["matches_count"] + 1
     return Tournament(**tournament_helper(tournament))
 
 @router.delete("/tournament/{tournament_id}/match/{match_id}", response_model=dict)
-async def delete_match_from_tournament(tournament_id: str, match_id: str, current_user: UserInDB = Depends(get_current_active_user)):
+async def delete_match_from_tournament(tournament_id: str, match_id: str, tournament_oid: ObjectId = Depends(parse_tournament_id), match_oid: ObjectId = Depends(parse_match_id), current_user: UserInDB = Depends(get_current_active_user)):
     """Delete a match from a tournament"""
     db = await get_database()
     
     # Check if tournament exists
-    tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    tournament = await db.tournaments.find_one({"_id": tournament_oid})
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     
@@ -776,22 +716,20 @@ async def delete_match_from_tournament(tournament_id: str, match_id: str, curren
         )
     
     # Check if match exists and belongs to this tournament
-    try:
-        match = await db.matches.find_one({"_id": ObjectId(match_id), "tournament_id": tournament_id})
-        if not match:
-            raise HTTPException(status_code=404, detail="Match not found in this tournament")
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid match ID format")
+    match = await db.matches.find_one({"_id": match_oid, "tournament_id": tournament_id})
+    if not match:
+        raise HTTPException(status_code=404, detail="Match not found in this tournament")
     
     # Delete the match
-    await db.matches.delete_one({"_id": ObjectId(match_id)})
-    logger.info(f"Deleted match {match_id} from tournament {tournament_id} by user {current_user_id}")
+    await db.matches.delete_one({"_id": match_oid})
+    invalidate_player_stats(match["player1_id"], match["player2_id"])
+    logger.info("Deleted match %s from tournament %s by user %s", match_id, tournament_id, current_user_id)
     
     # Update tournament matches count
     current_matches_count = tournament.get("matches_count", 0)
     new_matches_count = max(0, current_matches_count - 1)  # Ensure count doesn't go below 0
     await db.tournaments.update_one(
-        {"_id": ObjectId(tournament_id)}, 
+        {"_id": tournament_oid}, 
         {"$set": {"matches_count": new_matches_count}}
     )
     
@@ -802,13 +740,15 @@ async def edit_match_in_tournament(
     tournament_id: str, 
     match_id: str, 
     match_update: MatchUpdate, 
+    tournament_oid: ObjectId = Depends(parse_tournament_id),
+    match_oid: ObjectId = Depends(parse_match_id),
     current_user: UserInDB = Depends(get_current_active_user)
 ):
     """Edit a match in a tournament"""
     db = await get_database()
     
     # Check if tournament exists
-    tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    tournament = await db.tournaments.find_one({"_id": tournament_oid})
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     
@@ -823,12 +763,9 @@ async def edit_match_in_tournament(
         )
     
     # Check if match exists and belongs to this tournament
-    try:
-        match = await db.matches.find_one({"_id": ObjectId(match_id), "tournament_id": tournament_id})
-        if not match:
-            raise HTTPException(status_code=404, detail="Match not found in this tournament")
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid match ID format")
+    match = await db.matches.find_one({"_id": match_oid, "tournament_id": tournament_id})
+    if not match:
+        raise HTTPException(status_code=404, detail="Match not found in this tournament")
     
     # Get only the fields that are provided in the update request
     update_data = match_update.model_dump(exclude_unset=True)
@@ -838,21 +775,22 @@ async def edit_match_in_tournament(
     
     # Update the match
     await db.matches.update_one(
-        {"_id": ObjectId(match_id)}, 
+        {"_id": match_oid}, 
         {"$set": update_data}
     )
+    invalidate_player_stats(match["player1_id"], match["player2_id"])
     
     # Return the updated match
-    updated_match = await db.matches.find_one({"_id": ObjectId(match_id)})
-    return Match(**await match_helper(updated_match, db))
+    updated_match = await db.matches.find_one({"_id": match_oid})
+    return await match_helper(updated_match, db)
 
 @router.post("/{tournament_id}/end", response_model=Tournament)
-async def end_tournament(tournament_id: str, current_user: UserInDB = Depends(get_current_active_user)):
+async def end_tournament(tournament_id: str, tournament_oid: ObjectId = Depends(parse_tournament_id), current_user: UserInDB = Depends(get_current_active_user)):
     """End a tournament by marking it as completed and setting the end date"""
     db = await get_database()
     
     # Check if tournament exists
-    tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
+    tournament = await db.tournaments.find_one({"_id": tournament_oid})
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
     
@@ -875,7 +813,7 @@ async def end_tournament(tournament_id: str, current_user: UserInDB = Depends(ge
     
     # Get all players in the tournament
     player_ids = tournament.get("player_ids", [])
-    logger.info(f"Ending tournament {tournament_id} with {len(player_ids)} players")
+    logger.info("Ending tournament %s with %s players", tournament_id, len(player_ids))
     
     # Update tournament to mark it as completed and set end date
     current_time = datetime.now()
@@ -885,7 +823,7 @@ async def end_tournament(tournament_id: str, current_user: UserInDB = Depends(ge
     }
     
     await db.tournaments.update_one(
-        {"_id": ObjectId(tournament_id)}, 
+        {"_id": tournament_oid}, 
         {"$set": update_data}
     )
     
@@ -901,15 +839,16 @@ async def end_tournament(tournament_id: str, current_user: UserInDB = Depends(ge
                 {"$inc": {"tournaments_played": 1}}
             )
             
-            logger.info(f"Updated tournaments_played count for {result.modified_count} players in tournament {tournament_id}")
+            logger.info("Updated tournaments_played count for %s players in tournament %s", result.modified_count, tournament_id)
             
         except Exception as e:
-            logger.error(f"Error updating player tournament counts: {e}")
+            logger.error("Error updating player tournament counts: %s", e)
             # Don't fail the entire operation if player count update fails
             # The tournament is still marked as completed
+        invalidate_player_stats(*player_ids)
     
     # Return the updated tournament
-    updated_tournament = await db.tournaments.find_one({"_id": ObjectId(tournament_id)})
-    logger.info(f"Tournament {tournament_id} ended by user {current_user_id} at {current_time}")
+    updated_tournament = await db.tournaments.find_one({"_id": tournament_oid})
+    logger.info("Tournament %s ended by user %s at %s", tournament_id, current_user_id, current_time)
     
     return Tournament(**tournament_helper(updated_tournament))
\ No newline at end of file
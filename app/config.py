@@ -21,6 +21,12 @@ class Settings:
     # Database
     MONGO_URI: str = get_env_var("MONGO_URI") or get_env_var(f"MONGO_URI_{ENVIRONMENT.upper()}")
     DATABASE_NAME: str = "fifa_rivalry"
+    MONGO_MAX_POOL_SIZE: int = int(get_env_var("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE: int = int(get_env_var("MONGO_MIN_POOL_SIZE", "10"))
+    # zlib ships with Python; zstd / snappy need the zstandard / python-snappy packages
+    MONGO_COMPRESSORS: str = get_env_var("MONGO_COMPRESSORS", "zlib")
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(get_env_var("MONGO_SERVER_SELECTION_TIMEOUT_MS", "3000"))
+    MONGO_SOCKET_TIMEOUT_MS: int = int(get_env_var("MONGO_SOCKET_TIMEOUT_MS", "10000"))
     
     # JWT Authentication
     SECRET_KEY: str = get_env_var("SECRET_KEY", "your-secret-key-here-change-in-production")
@@ -4,7 +4,7 @@ from .match import MatchCreate, Match, MatchUpdate, HeadToHeadStats, RecentMatch
 from .tournament import TournamentCreate, Tournament, TournamentPlayerStats, TournamentPlayer
 from .auth import UserCreate, User, UserLogin, Token, TokenData, UserInDB
 from .user import FriendRequest, FriendResponse, NonFriendPlayer
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 from typing import Generic, TypeVar, List
 
 # Generic type for paginated responses
@@ -16,9 +16,27 @@ class PaginatedResponse(BaseModel, Generic[T]):
     total: int
     page: int
     page_size: int
-    total_pages: int
-    has_next: bool
-    has_previous: bool
+
+    @computed_field
+    @property
+    def total_pages(self) -> int:
+        return -(-self.total // self.page_size)
+
+    @computed_field
+    @property
+    def has_next(self) -> bool:
+        return self.page < self.total_pages
+
+    @computed_field
+    @property
+    def has_previous(self) -> bool:
+        return self.page > 1
+
+
+# Concrete specializations used by the endpoints, built once at import time
+PaginatedMatch = PaginatedResponse[Match]
+PaginatedPlayer = PaginatedResponse[Player]
+PaginatedTournament = PaginatedResponse[Tournament]
 
 __all__ = [
     # Player models
@@ -54,4 +72,7 @@ __all__ = [
     
     # Pagination models
     "PaginatedResponse",
+    "PaginatedMatch",
+    "PaginatedPlayer",
+    "PaginatedTournament",
 ]
@@ -4,8 +4,11 @@ from pydantic import BaseModel, Field
 
 
 class MatchCreate(BaseModel):
-    player1_id: str
-    player2_id: str
+    # Player ids are stored on match documents as hex strings, not ObjectIds: every match
+    # query filters on the string id (player stats, head-to-head, tournament generators),
+    # and the $lookup joins convert with $convert. Changing the type needs a data migration.
+    player1_id: str  # str(user ObjectId)
+    player2_id: str  # str(user ObjectId)
     player1_goals: int
     player2_goals: int
     tournament_id: Optional[str] = None
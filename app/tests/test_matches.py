@@ -342,6 +342,45 @@ class TestMatchIntegration:
         assert updated_player1["last_5_teams"] == ["Barcelona"]
         assert updated_player2["last_5_teams"] == ["Real Madrid"]
 
+    def test_edit_match_win_to_draw_updates_player_stats(self, client: TestClient, created_players):
+        """Test that editing a win into a draw adjusts results and points without adding a match"""
+        player1, player2 = created_players
+        
+        match_data = {
+            "player1_id": player1["id"],
+            "player2_id": player2["id"],
+            "player1_goals": 3,
+            "player2_goals": 1,
+            "team1": "Barcelona",
+            "team2": "Real Madrid",
+            "half_length": 4
+        }
+        
+        match_response = client.post("/api/v1/matches/", json=match_data)
+        assert match_response.status_code == 200
+        match_id = match_response.json()["id"]
+        
+        # Edit the 3-1 win into a 2-2 draw
+        update_response = client.put(
+            f"/api/v1/matches/{match_id}",
+            json={"player1_goals": 2, "player2_goals": 2, "half_length": 4}
+        )
+        assert update_response.status_code == 200
+        
+        updated_player1 = client.get(f"/api/v1/players/{player1['id']}").json()
+        updated_player2 = client.get(f"/api/v1/players/{player2['id']}").json()
+        
+        # Still a single match for each player, now a draw worth 1 point
+        for player in (updated_player1, updated_player2):
+            assert player["total_matches"] == 1
+            assert player["wins"] == 0
+            assert player["losses"] == 0
+            assert player["draws"] == 1
+            assert player["points"] == 1
+            assert player["total_goals_scored"] == 2
+            assert player["total_goals_conceded"] == 2
+            assert player["goal_difference"] == 0
+
     def test_multiple_matches_stats_and_elo_accumulation(self, client: TestClient, created_players):
         """Test that multiple matches correctly accumulate player statistics"""
         player1, player2 = created_players
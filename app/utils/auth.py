@@ -79,7 +79,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     
     db = await get_database()
     user = await db.users.find_one({"username": token_data.username})
-    logger.debug(f"User found: {user}")
+    logger.debug("User found: %s", user)
     
     if user is None:
         raise HTTPException(
@@ -203,4 +203,44 @@ def user_helper(user: dict) -> dict:
         "friend_requests_received": user.get("friend_requests_received", []),
         # Team tracking fields
         "last_5_teams": user.get("last_5_teams", []),
-    } 
\ No newline at end of file
+    }
+
+
+def _default(field: str, default):
+    return {"$ifNull": [f"${field}", default]}
+
+
+# $project stage producing the same shape as user_helper on the server, so list endpoints
+# can return documents as they come back from the driver
+USER_RESPONSE_PROJECTION = {
+    "$project": {
+        "_id": 0,
+        "id": {"$toString": "$_id"},
+        "username": {"$cond": [_default("is_deleted", False), "Deleted Player", "$username"]},
+        "email": {"$cond": [
+            {"$in": [_default("email", ""), [""]]},
+            {"$concat": [_default("username", "unknown"), "@fifa-tracker.local"]},
+            "$email",
+        ]},
+        "first_name": _default("first_name", None),
+        "last_name": _default("last_name", None),
+        "is_active": _default("is_active", True),
+        "is_superuser": _default("is_superuser", False),
+        "is_deleted": _default("is_deleted", False),
+        "created_at": _default("created_at", "$$NOW"),
+        "updated_at": _default("updated_at", "$$NOW"),
+        "deleted_at": _default("deleted_at", None),
+        # OAuth fields
+        "oauth_provider": _default("oauth_provider", "local"),
+        "oauth_id": _default("oauth_id", None),
+        # Player statistics fields
+        **{field: _default(field, 0) for field in (
+            "total_matches", "total_goals_scored", "total_goals_conceded", "goal_difference",
+            "wins", "losses", "draws", "points", "tournaments_played",
+        )},
+        "elo_rating": _default("elo_rating", 1200),
+        **{field: _default(field, []) for field in (
+            "tournament_ids", "friends", "friend_requests_sent", "friend_requests_received", "last_5_teams",
+        )},
+    }
+}
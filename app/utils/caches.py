@@ -0,0 +1,67 @@
+from time import monotonic
+from typing import Any, Dict, Hashable, Tuple
+
+from bson import ObjectId
+
+
+class TTLCache:
+    """Small in-process cache whose entries expire ttl seconds after being set"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting expired then oldest entries when full"""
+        self._data.pop(key, None)
+        if len(self._data) >= self.maxsize:
+            now = monotonic()
+            for stale_key in [k for k, (expires_at, _) in self._data.items() if expires_at <= now]:
+                del self._data[stale_key]
+            while len(self._data) >= self.maxsize:
+                del self._data[next(iter(self._data))]
+        self._data[key] = (monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key, returning its value if it was cached and not expired"""
+        entry = self._data.pop(key, None)
+        if entry is None or entry[0] <= monotonic():
+            return default
+        return entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Player documents projected to {"_id", "username", "is_deleted"}, keyed by str(user_id).
+# Used by the match helpers; invalidate when a player's username or deleted flag changes.
+player_name_cache = TTLCache(maxsize=2048, ttl=30)
+
+# Per-player stats responses keyed by (kind, str(player ObjectId)), kind being one of STATS_KINDS.
+# Invalidate both players' entries when a match between them is recorded, updated or deleted.
+STATS_KINDS = ("summary", "detailed")
+stats_cache = TTLCache(maxsize=512, ttl=30)
+
+
+def invalidate_player_stats(*player_ids) -> None:
+    """Drop the cached stats of the given players"""
+    for player_id in player_ids:
+        key = str(ObjectId(player_id)) if ObjectId.is_valid(player_id) else str(player_id)
+        for kind in STATS_KINDS:
+            stats_cache.pop((kind, key))
@@ -39,13 +39,13 @@ async def verify_google_token(token: str) -> GoogleOAuthUser:
         return google_user
         
     except ValueError as e:
-        logger.error(f"Invalid Google token: {e}")
+        logger.error("Invalid Google token: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid Google token"
         )
     except Exception as e:
-        logger.error(f"Error verifying Google token: {e}")
+        logger.error("Error verifying Google token: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error verifying Google token"
@@ -72,7 +72,7 @@ async def exchange_code_for_token(code: str) -> Dict[str, str]:
             response.raise_for_status()
             return response.json()
         except httpx.HTTPStatusError as e:
-            logger.error(f"Error exchanging code for token: {e}")
+            logger.error("Error exchanging code for token: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Failed to exchange authorization code for token"
@@ -104,7 +104,7 @@ async def get_google_user_info(access_token: str) -> GoogleOAuthUser:
             return google_user
             
         except httpx.HTTPStatusError as e:
-            logger.error(f"Error getting Google user info: {e}")
+            logger.error("Error getting Google user info: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Failed to get user information from Google"
@@ -147,7 +147,7 @@ async def create_or_get_google_user(google_user: GoogleOAuthUser, db) -> Dict:
     })
     
     if existing_user:
-        logger.info(f"Found existing Google user: {existing_user['username']}")
+        logger.info("Found existing Google user: %s", existing_user['username'])
         return existing_user
     
     # Check if user exists with same email
@@ -166,7 +166,7 @@ async def create_or_get_google_user(google_user: GoogleOAuthUser, db) -> Dict:
                 }
             }
         )
-        logger.info(f"Linked existing user {existing_email_user['username']} with Google OAuth")
+        logger.info("Linked existing user %s with Google OAuth", existing_email_user['username'])
         return await db.users.find_one({"_id": existing_email_user["_id"]})
     
     # Create new user
@@ -215,5 +215,5 @@ async def create_or_get_google_user(google_user: GoogleOAuthUser, db) -> Dict:
     result = await db.users.insert_one(user_data)
     created_user = await db.users.find_one({"_id": result.inserted_id})
     
-    logger.info(f"Created new Google OAuth user: {username}")
+    logger.info("Created new Google OAuth user: %s", username)
     return created_user
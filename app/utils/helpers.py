@@ -1,13 +1,35 @@
 from datetime import datetime
 from bson import ObjectId
 from app.models import Player, Match, Tournament
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 from app.utils.logging import get_logger
-import time
+from app.utils.caches import player_name_cache
+from functools import lru_cache
+from time import perf_counter
+import asyncio
 import itertools
+import logging
+import operator
 
 logger = get_logger(__name__)
 
+# Placeholder names returned by the match formatting helpers
+_UNKNOWN_PLAYER = "Unknown Player"
+_DELETED_PLAYER = "Deleted Player"
+_ERROR_PLAYER = "Error"
+_UNKNOWN_TEAM = "Unknown"
+
+
+def _to_object_id(value) -> ObjectId:
+    """Return value as an ObjectId, skipping the hex parse when it already is one"""
+    return value if isinstance(value, ObjectId) else ObjectId(value)
+
+
+@lru_cache(maxsize=4096)
+def _oid_to_str(oid) -> str:
+    """Memoized str() for ObjectIds, which hex-encodes on every call"""
+    return str(oid)
+
 
 def generate_round_robin_matches(player_ids: List[str], tournament_id: str, rounds_per_matchup: int = 2) -> List[dict]:
     """
@@ -52,7 +74,7 @@ def generate_round_robin_matches(player_ids: List[str], tournament_id: str, roun
             }
             matches.append(match_dict)
     
-    logger.info(f"Generated {len(matches)} round-robin matches for {len(player_ids)} players with {rounds_per_matchup} rounds per matchup")
+    logger.info("Generated %s round-robin matches for %s players with %s rounds per matchup", len(matches), len(player_ids), rounds_per_matchup)
     return matches
 
 
@@ -124,168 +146,412 @@ def generate_missing_matches(existing_matches: List[dict], player_ids: List[str]
                 # Mark this matchup as created to avoid duplicates
                 existing_matchups[matchup_key] = 1
     
-    logger.info(f"Generated {len(new_matches)} missing matches for {len(player_ids)} players. Preserved {len(existing_matches)} existing matches.")
+    logger.info("Generated %s missing matches for %s players. Preserved %s existing matches.", len(new_matches), len(player_ids), len(existing_matches))
     return new_matches
 
 
 
 
-async def match_helper(match : Match, db) -> dict:
-    """Convert match document to dict format with player names"""
-    start_time = time.time()
-    match_id = str(match.get("_id", "unknown"))
-    logger.info(f"Starting match_helper for match_id: {match_id}")
+def _player_display_name(player: Optional[dict]) -> str:
+    """Name shown for a player document, handling deleted and missing players"""
+    if not player:
+        return _UNKNOWN_PLAYER
+    if player.get("is_deleted", False):
+        return _DELETED_PLAYER
+    return player["username"]
+
+
+def _match_date(match: dict) -> datetime:
+    """Match date, reading the clock only when the document has none"""
+    date = match.get("date")
+    return date if date is not None else datetime.now()
+
+
+def _match_player(match: dict, field: str, player_id, players_cache: Dict[str, dict]) -> Optional[dict]:
+    """Player document embedded under match[field] by a $lookup, falling back to players_cache"""
+    if field in match:
+        return match[field]
+    return players_cache.get(_oid_to_str(player_id))
+
+
+def _player_lookup_stages(field: str) -> List[dict]:
+    """$lookup stages embedding the projected user for match[f"{field}_id"] as match[field] (or None)"""
+    return [
+        {"$lookup": {
+            "from": "users",
+            "let": {"player_id": {"$convert": {"input": f"${field}_id", "to": "objectId", "onError": None, "onNull": None}}},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$_id", "$$player_id"]}}},
+                {"$project": {"username": 1, "is_deleted": 1}},
+            ],
+            "as": field,
+        }},
+        {"$set": {field: {"$ifNull": [{"$arrayElemAt": [f"${field}", 0]}, None]}}},
+    ]
+
+
+def _tournament_lookup_stages() -> List[dict]:
+    """$lookup stages embedding the tournament name for match["tournament_id"] as match["tournament"] (or None)"""
+    return [
+        {"$lookup": {
+            "from": "tournaments",
+            "let": {"tournament_id": {"$convert": {"input": "$tournament_id", "to": "objectId", "onError": None, "onNull": None}}},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$_id", "$$tournament_id"]}}},
+                {"$project": {"name": 1}},
+            ],
+            "as": "tournament",
+        }},
+        {"$set": {"tournament": {"$ifNull": [{"$arrayElemAt": ["$tournament", 0]}, None]}}},
+    ]
+
+
+def matches_with_players_pipeline(
+    match_filter: Optional[dict] = None,
+    sort: Optional[dict] = None,
+    limit: Optional[int] = None,
+    skip: int = 0,
+    include_tournament: bool = True,
+) -> List[dict]:
+    """
+    Aggregation pipeline returning matches with players and tournament joined server-side.
+    
+    Each match gets "player1" / "player2" holding the projected user document
+    (or None when the user does not exist) and, unless include_tournament is False,
+    "tournament" holding {"_id", "name"} (or None). format_match, match_helper and
+    match_helpers_batch use these directly instead of querying, so a list endpoint
+    needs a single round trip.
+    """
+    pipeline = []
+    if match_filter:
+        pipeline.append({"$match": match_filter})
+    if sort:
+        pipeline.append({"$sort": sort})
+    if skip:
+        pipeline.append({"$skip": skip})
+    if limit:
+        pipeline.append({"$limit": limit})
+    pipeline.extend(_player_lookup_stages("player1"))
+    pipeline.extend(_player_lookup_stages("player2"))
+    if include_tournament:
+        pipeline.extend(_tournament_lookup_stages())
+    return pipeline
+
+
+def _error_match_result(match: dict) -> dict:
+    """Minimal valid response used when a match cannot be formatted"""
+    return {
+        "id": str(match.get("_id", "unknown")),
+        "player1_name": _ERROR_PLAYER,
+        "player2_name": _ERROR_PLAYER,
+        "player1_goals": 0,
+        "player2_goals": 0,
+        "date": datetime.now(),
+        "half_length": match.get("half_length", 4),  # Default to 4 minutes if not set
+    }
+
+
+def format_match(match: dict, players_cache: Dict[str, dict], tournaments_cache: Dict[str, dict]) -> dict:
+    """
+    Convert match document to dict format with player names, synchronously.
     
+    Players and tournaments are resolved only from the given caches (documents
+    keyed by str(_id)); ids missing from a cache resolve to "Unknown Player" /
+    no tournament name.
+    """
     try:
-        # Get player information
         player1_id = match.get("player1_id")
         player2_id = match.get("player2_id")
+        has_players = bool(player1_id and player2_id)
         
-        if not player1_id or not player2_id:
-            logger.error(f"Match missing player IDs: {match.get('_id')}")
-            error_time = time.time()
-            logger.info(f"match_helper completed with error in {(error_time - start_time) * 1000:.2f}ms - match_id: {match_id}")
-            return {
-                "id": str(match["_id"]),
-                "player1_name": "Unknown Player",
-                "player2_name": "Unknown Player",
-                "player1_goals": match.get("player1_goals", 0),
-                "player2_goals": match.get("player2_goals", 0),
-                "date": match.get("date", datetime.now()),
-                "team1": match.get("team1", "Unknown"),
-                "team2": match.get("team2", "Unknown"),
-                "half_length": match.get("half_length", 4),  # Default to 4 minutes if not set
-            }
-        
-        # Find players
-        players_start = time.time()
-        player1 : Player = await db.users.find_one({"_id": ObjectId(player1_id)})
-        player2 : Player = await db.users.find_one({"_id": ObjectId(player2_id)})
-        players_time = time.time()
-        logger.info(f"Player queries completed in {(players_time - players_start) * 1000:.2f}ms - match_id: {match_id}, player1_id: {player1_id}, player2_id: {player2_id}")
-        
-        # Handle deleted players
-        if player1 and player1.get("is_deleted", False):
-            player1_name = "Deleted Player"
-        else:
-            player1_name = player1["username"] if player1 else "Unknown Player"
-            
-        if player2 and player2.get("is_deleted", False):
-            player2_name = "Deleted Player"
+        if has_players:
+            player1_name = _player_display_name(_match_player(match, "player1", player1_id, players_cache))
+            player2_name = _player_display_name(_match_player(match, "player2", player2_id, players_cache))
         else:
-            player2_name = player2["username"] if player2 else "Unknown Player"
+            logger.error("Match missing player IDs: %s", match.get('_id'))
+            player1_name = player2_name = _UNKNOWN_PLAYER
         
         result = {
-            "id": str(match["_id"]),
+            "id": str(match.get("_id", "unknown")),
             "player1_name": player1_name,
             "player2_name": player2_name,
             "player1_goals": match.get("player1_goals", 0),
             "player2_goals": match.get("player2_goals", 0),
-            "date": match.get("date", datetime.now()),
-            "team1": match.get("team1", "Unknown"),
-            "team2": match.get("team2", "Unknown"),
+            "date": _match_date(match),
+            "team1": match.get("team1", _UNKNOWN_TEAM),
+            "team2": match.get("team2", _UNKNOWN_TEAM),
             "half_length": match.get("half_length", 4),  # Default to 4 minutes if not set
         }
+        if not has_players:
+            return result
         
         # Add tournament info if available
-        tournament_start = time.time()
-        if match.get("tournament_id"):
-            tournament : Tournament = await db.tournaments.find_one({"_id": ObjectId(match["tournament_id"])})
+        tournament_id = match.get("tournament_id")
+        if tournament_id:
+            if "tournament" in match:
+                tournament : Tournament = match["tournament"]
+            else:
+                tournament : Tournament = tournaments_cache.get(_oid_to_str(tournament_id))
             if tournament:
                 result["tournament_name"] = tournament["name"]
-        tournament_time = time.time()
-        if match.get("tournament_id"):
-            logger.info(f"Tournament query completed in {(tournament_time - tournament_start) * 1000:.2f}ms - match_id: {match_id}, tournament_id: {match['tournament_id']}")
-        
-        total_time = time.time()
-        logger.info(f"match_helper completed successfully in {(total_time - start_time) * 1000:.2f}ms - match_id: {match_id}, player1: {player1_name}, player2: {player2_name}")
         
         return result
     except Exception as e:
-        error_time = time.time()
-        logger.error(f"Error in match_helper: {str(e)} - match_id: {match_id}")
-        logger.info(f"match_helper failed with exception in {(error_time - start_time) * 1000:.2f}ms - match_id: {match_id}")
-        # Return a minimal valid response
-        return {
-            "id": str(match.get("_id", "unknown")),
-            "player1_name": "Error",
-            "player2_name": "Error",
-            "player1_goals": 0,
-            "player2_goals": 0,
-            "date": datetime.now(),
-            "half_length": match.get("half_length", 4),  # Default to 4 minutes if not set
-        }
+        logger.error("Error formatting match: %s - match_id: %s", e, match.get('_id', 'unknown'))
+        return _error_match_result(match)
 
 
-def get_result(player1_goals, player2_goals, is_player1):
-    """Calculate win/loss/draw result for a player"""
-    if is_player1:
-        if player1_goals > player2_goals:
-            return {"win": 1, "loss": 0, "draw": 0}
-        elif player1_goals < player2_goals:
-            return {"win": 0, "loss": 1, "draw": 0}
-        else:
-            return {"win": 0, "loss": 0, "draw": 1}
-    else:
-        if player2_goals > player1_goals:
-            return {"win": 1, "loss": 0, "draw": 0}
-        elif player2_goals < player1_goals:
-            return {"win": 0, "loss": 1, "draw": 0}
+async def match_helper(match : Match, db, players_cache: Optional[Dict[str, dict]] = None, tournaments_cache: Optional[Dict[str, dict]] = None) -> dict:
+    """
+    Convert match document to dict format with player names.
+    
+    When players_cache / tournaments_cache are given (documents keyed by str(_id)),
+    names are resolved from them instead of querying the database. Players and the
+    tournament embedded by matches_with_players_pipeline are used as-is.
+    """
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    start_time = perf_counter() if debug_enabled else 0.0
+    
+    try:
+        player1_id = match.get("player1_id")
+        player2_id = match.get("player2_id")
+        
+        # Resolve players from the shared TTL cache first, validating ids before any query is issued
+        player_lookups = {}
+        if players_cache is None:
+            players_cache = {}
+            if player1_id and player2_id:
+                for field, player_id in (("player1", player1_id), ("player2", player2_id)):
+                    if field in match:
+                        continue
+                    key = _oid_to_str(player_id)
+                    cached = player_name_cache.get(key)
+                    if cached is not None:
+                        players_cache[key] = cached
+                    elif key not in player_lookups:
+                        player_lookups[key] = _to_object_id(player_id)
+        tournament_key = None
+        if tournaments_cache is None:
+            tournaments_cache = {}
+            tournament_id = match.get("tournament_id")
+            if tournament_id and "tournament" not in match:
+                tournament_oid = _to_object_id(tournament_id)
+                tournament_key = _oid_to_str(tournament_id)
+        
+        # Run the remaining independent player and tournament lookups concurrently
+        lookups = [
+            db.users.find_one({"_id": oid}, projection={"username": 1, "is_deleted": 1})
+            for oid in player_lookups.values()
+        ]
+        if tournament_key is not None:
+            lookups.append(db.tournaments.find_one({"_id": tournament_oid}, projection={"name": 1}))
+        documents = await asyncio.gather(*lookups)
+        
+        for key, player in zip(player_lookups, documents):
+            if player:
+                players_cache[key] = player
+                player_name_cache.set(key, player)
+        
+        if tournament_key is not None:
+            tournament : Tournament = documents[-1]
+            if tournament:
+                tournaments_cache[tournament_key] = tournament
+    except Exception as e:
+        logger.error("Error in match_helper: %s - match_id: %s", e, match.get('_id', 'unknown'))
+        return _error_match_result(match)
+    
+    result = format_match(match, players_cache, tournaments_cache)
+    
+    if debug_enabled:
+        logger.debug("match_helper completed in %.2fms - match_id: %s, player1: %s, player2: %s", (perf_counter() - start_time) * 1000, result['id'], result['player1_name'], result['player2_name'])
+    
+    return result
+
+
+async def match_helpers_batch(matches: List[dict], db, tournaments_cache: Optional[Dict[str, dict]] = None) -> List[dict]:
+    """
+    Convert a list of match documents to dict format with player names.
+    
+    Players and tournaments referenced by the matches are fetched with one $in
+    query each, instead of one query per match, and every match is then formatted
+    synchronously with format_match. Players and tournaments already embedded by
+    matches_with_players_pipeline are not queried. Pass tournaments_cache (keyed by str(_id))
+    when the caller already holds the tournament documents to skip that query.
+    
+    Unlike match_helper, malformed player ids do not fail the match: they are left
+    out of the query and resolve to "Unknown Player" rather than "Error".
+    """
+    player_ids = set()
+    tournament_ids = set()
+    for match in matches:
+        for field, player_id in (("player1", match.get("player1_id")), ("player2", match.get("player2_id"))):
+            if field not in match and player_id and ObjectId.is_valid(player_id):
+                player_ids.add(_to_object_id(player_id))
+        if tournaments_cache is None:
+            tournament_id = match.get("tournament_id")
+            if tournament_id and "tournament" not in match and ObjectId.is_valid(tournament_id):
+                tournament_ids.add(_to_object_id(tournament_id))
+    
+    players_cache = {}
+    missing_ids = []
+    for player_id in player_ids:
+        key = _oid_to_str(player_id)
+        cached = player_name_cache.get(key)
+        if cached is not None:
+            players_cache[key] = cached
         else:
-            return {"win": 0, "loss": 0, "draw": 1}
+            missing_ids.append(player_id)
+    if missing_ids:
+        players = await db.users.find(
+            {"_id": {"$in": missing_ids}},
+            {"username": 1, "is_deleted": 1}
+        ).to_list(None)
+        for player in players:
+            key = _oid_to_str(player["_id"])
+            players_cache[key] = player
+            player_name_cache.set(key, player)
+    
+    if tournaments_cache is None:
+        tournaments_cache = {}
+        if tournament_ids:
+            tournaments = await db.tournaments.find(
+                {"_id": {"$in": list(tournament_ids)}},
+                {"name": 1}
+            ).to_list(None)
+            tournaments_cache = {_oid_to_str(tournament["_id"]): tournament for tournament in tournaments}
+    
+    return [format_match(match, players_cache, tournaments_cache) for match in matches]
+
 
+def match_outcome(goals_for: int, goals_against: int) -> Tuple[int, int, int, int]:
+    """(win, loss, draw, points) for one side of a match, derived from the sign of the goal difference"""
+    sign = (goals_for > goals_against) - (goals_for < goals_against)
+    win = sign > 0
+    draw = sign == 0
+    return (int(win), int(sign < 0), int(draw), 3 * win + draw)
+
+
+def get_result(player1_goals, player2_goals, is_player1) -> Tuple[int, int, int, int]:
+    """Calculate the (win, loss, draw, points) result for a player"""
+    if is_player1:
+        return match_outcome(player1_goals, player2_goals)
+    return match_outcome(player2_goals, player1_goals)
 
-def calculate_tournament_stats(player_id: str, matches: List[dict]) -> dict:
+
+def calculate_tournament_stats(player_id: Union[str, ObjectId], matches: List[dict]) -> dict:
     """Calculate tournament statistics for a specific player based on match data"""
-    stats = {
-        "total_matches": 0,
-        "total_goals_scored": 0,
-        "total_goals_conceded": 0,
-        "wins": 0,
-        "losses": 0,
-        "draws": 0,
-        "points": 0
+    # Match documents may hold player IDs as strings or ObjectIds; matching against both
+    # forms by hash avoids hex-encoding every stored ObjectId with str()
+    target_ids = {_oid_to_str(player_id)}
+    if ObjectId.is_valid(player_id):
+        target_ids.add(_to_object_id(player_id))
+    
+    # Single pass: collect goals scored/conceded for the matches this player is involved in
+    scored = []
+    conceded = []
+    for match in matches:
+        if match.get("player1_id") in target_ids:
+            scored.append(match.get("player1_goals", 0))
+            conceded.append(match.get("player2_goals", 0))
+        elif match.get("player2_id") in target_ids:
+            scored.append(match.get("player2_goals", 0))
+            conceded.append(match.get("player1_goals", 0))
+    
+    # Element-wise reductions run in C via sum()/map() instead of per-match Python branches
+    total_matches = len(scored)
+    wins = sum(map(operator.gt, scored, conceded))
+    losses = sum(map(operator.lt, scored, conceded))
+    draws = total_matches - wins - losses
+    total_goals_scored = sum(scored)
+    total_goals_conceded = sum(conceded)
+    
+    return {
+        "total_matches": total_matches,
+        "total_goals_scored": total_goals_scored,
+        "total_goals_conceded": total_goals_conceded,
+        "wins": wins,
+        "losses": losses,
+        "draws": draws,
+        # 3 points for a win, 1 for a draw
+        "points": (wins * 3) + draws,
+        "goal_difference": total_goals_scored - total_goals_conceded,
     }
+
+
+def calculate_all_tournament_stats(matches: List[dict]) -> Dict[str, dict]:
+    """
+    Calculate tournament statistics for every player in a single pass over the matches.
     
+    Returns a dict keyed by player ID string with the same fields as
+    calculate_tournament_stats; players without matches are absent.
+    """
+    # Map each player to an int slot once, then accumulate into flat per-column lists
+    index: Dict[str, int] = {}
+    played, scored, conceded, wins, losses = [], [], [], [], []
+    columns = (played, scored, conceded, wins, losses)
     for match in matches:
-        player1_id = match.get("player1_id")
-        player2_id = match.get("player2_id")
         player1_goals = match.get("player1_goals", 0)
         player2_goals = match.get("player2_goals", 0)
         
-        # Convert ObjectIds to strings for comparison
-        player1_id_str = str(player1_id) if player1_id else None
-        player2_id_str = str(player2_id) if player2_id else None
-        
-        # Skip matches where this player is not involved
-        if player_id not in [player1_id_str, player2_id_str]:
-            continue
+        for player_id, goals_scored, goals_conceded in (
+            (match.get("player1_id"), player1_goals, player2_goals),
+            (match.get("player2_id"), player2_goals, player1_goals),
+        ):
+            if not player_id:
+                continue
             
-        stats["total_matches"] += 1
-        
-        # Determine if this player is player1 or player2
-        is_player1 = player_id == player1_id_str
-        
-        if is_player1:
-            stats["total_goals_scored"] += player1_goals
-            stats["total_goals_conceded"] += player2_goals
-            result = get_result(player1_goals, player2_goals, True)
-        else:
-            stats["total_goals_scored"] += player2_goals
-            stats["total_goals_conceded"] += player1_goals
-            result = get_result(player1_goals, player2_goals, False)
-        
-        stats["wins"] += result["win"]
-        stats["losses"] += result["loss"]
-        stats["draws"] += result["draw"]
-        
-        # Calculate points (3 for win, 1 for draw, 0 for loss)
-        stats["points"] += (result["win"] * 3) + (result["draw"] * 1)
+            key = _oid_to_str(player_id)
+            i = index.get(key)
+            if i is None:
+                i = index[key] = len(played)
+                for column in columns:
+                    column.append(0)
+            
+            played[i] += 1
+            scored[i] += goals_scored
+            conceded[i] += goals_conceded
+            wins[i] += goals_scored > goals_conceded
+            losses[i] += goals_scored < goals_conceded
     
-    # Calculate goal difference
-    stats["goal_difference"] = stats["total_goals_scored"] - stats["total_goals_conceded"]
+    all_stats = {}
+    for key, i in index.items():
+        draws = played[i] - wins[i] - losses[i]
+        all_stats[key] = {
+            "total_matches": played[i],
+            "total_goals_scored": scored[i],
+            "total_goals_conceded": conceded[i],
+            "wins": wins[i],
+            "losses": losses[i],
+            "draws": draws,
+            # 3 points for a win, 1 for a draw
+            "points": (wins[i] * 3) + draws,
+            "goal_difference": scored[i] - conceded[i],
+        }
     
-    return stats
+    return all_stats
+
+
+def _head_to_head_pipeline(match_filter: dict, player1_id: str) -> List[dict]:
+    """Aggregation reducing the matches between two players to one document of counters, from player1's side"""
+    player1_first = {"$eq": ["$player1_id", player1_id]}
+    player1_goals = {"$ifNull": ["$player1_goals", 0]}
+    player2_goals = {"$ifNull": ["$player2_goals", 0]}
+    return [
+        {"$match": match_filter},
+        {"$project": {
+            "p1_goals": {"$cond": [player1_first, player1_goals, player2_goals]},
+            "p2_goals": {"$cond": [player1_first, player2_goals, player1_goals]},
+        }},
+        {"$group": {
+            "_id": None,
+            "total_matches": {"$sum": 1},
+            "player1_wins": {"$sum": {"$cond": [{"$gt": ["$p1_goals", "$p2_goals"]}, 1, 0]}},
+            "player2_wins": {"$sum": {"$cond": [{"$lt": ["$p1_goals", "$p2_goals"]}, 1, 0]}},
+            "draws": {"$sum": {"$cond": [{"$eq": ["$p1_goals", "$p2_goals"]}, 1, 0]}},
+            "player1_goals": {"$sum": "$p1_goals"},
+            "player2_goals": {"$sum": "$p2_goals"},
+        }},
+    ]
 
 
 async def calculate_head_to_head_stats(db, player1_id: str, player2_id: str, player1: dict, player2: dict) -> dict:
@@ -302,20 +568,24 @@ async def calculate_head_to_head_stats(db, player1_id: str, player2_id: str, pla
     Returns:
         Dictionary containing head-to-head statistics
     """
-    # Find all matches between these two players
-    matches = await db.matches.find({
+    # Count wins and goals on the server, fetching only the last 5 matches for the recent list
+    match_filter = {
         "$or": [
             {"player1_id": player1_id, "player2_id": player2_id},
             {"player1_id": player2_id, "player2_id": player1_id}
         ]
-    }).sort("date", -1).to_list(1000)
+    }
+    totals, recent = await asyncio.gather(
+        db.matches.aggregate(_head_to_head_pipeline(match_filter, player1_id)).to_list(1),
+        db.matches.find(match_filter).sort("date", -1).limit(5).to_list(5),
+    )
     
     # Initialize stats
     stats = {
         "player1_id": player1_id,
         "player2_id": player2_id,
-        "player1_name": player1.get("username", "Unknown Player"),
-        "player2_name": player2.get("username", "Unknown Player"),
+        "player1_name": player1.get("username", _UNKNOWN_PLAYER),
+        "player2_name": player2.get("username", _UNKNOWN_PLAYER),
         "total_matches": 0,
         "player1_wins": 0,
         "player2_wins": 0,
@@ -329,31 +599,9 @@ async def calculate_head_to_head_stats(db, player1_id: str, player2_id: str, pla
         "recent_matches": []
     }
     
-    # Process each match
-    for match in matches:
-        stats["total_matches"] += 1
-        
-        # Determine which player is player1 in this match
-        is_player1_first = match["player1_id"] == player1_id
-        
-        if is_player1_first:
-            p1_goals = match["player1_goals"]
-            p2_goals = match["player2_goals"]
-        else:
-            p1_goals = match["player2_goals"]
-            p2_goals = match["player1_goals"]
-        
-        # Add goals
-        stats["player1_goals"] += p1_goals
-        stats["player2_goals"] += p2_goals
-        
-        # Determine result
-        if p1_goals > p2_goals:
-            stats["player1_wins"] += 1
-        elif p1_goals < p2_goals:
-            stats["player2_wins"] += 1
-        else:
-            stats["draws"] += 1
+    if totals:
+        totals[0].pop("_id", None)
+        stats.update(totals[0])
     
     # Calculate derived statistics
     if stats["total_matches"] > 0:
@@ -362,9 +610,19 @@ async def calculate_head_to_head_stats(db, player1_id: str, player2_id: str, pla
         stats["player1_avg_goals"] = round(stats["player1_goals"] / stats["total_matches"], 2)
         stats["player2_avg_goals"] = round(stats["player2_goals"] / stats["total_matches"], 2)
     
-    # Get recent matches (last 5)
+    # Get recent matches (last 5), resolving their tournaments with a single $in query
+    tournament_ids = {
+        _to_object_id(match["tournament_id"])
+        for match in recent
+        if match.get("tournament_id") and ObjectId.is_valid(match["tournament_id"])
+    }
+    tournament_names = {}
+    if tournament_ids:
+        tournaments = await db.tournaments.find({"_id": {"$in": list(tournament_ids)}}, {"name": 1}).to_list(None)
+        tournament_names = {_oid_to_str(tournament["_id"]): tournament.get("name") for tournament in tournaments}
+    
     recent_matches = []
-    for match in matches[:5]:  # Get last 5 matches
+    for match in recent:
         # Determine which player is player1 in this match
         is_player1_first = match["player1_id"] == player1_id
         
@@ -378,9 +636,7 @@ async def calculate_head_to_head_stats(db, player1_id: str, player2_id: str, pla
         # Get tournament info if available
         tournament_name = None
         if match.get("tournament_id"):
-            tournament = await db.tournaments.find_one({"_id": ObjectId(match["tournament_id"])})
-            if tournament:
-                tournament_name = tournament.get("name")
+            tournament_name = tournament_names.get(_oid_to_str(match["tournament_id"]))
         
         recent_match = {
             "date": match.get("date"),
@@ -126,9 +126,9 @@ def setup_logging(
     
     # Log the configuration
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging configured - Level: {level}, Format: {format_str}")
+    logger.info("Logging configured - Level: %s, Format: %s", level, format_str)
     if file_path:
-        logger.info(f"Log file: {file_path}")
+        logger.info("Log file: %s", file_path)
 
 def get_logger(name: str) -> logging.Logger:
     """
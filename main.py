@@ -1,7 +1,7 @@
 
 from fastapi import FastAPI, Request
 from app.api.v1.router import api_router
-from app.api.dependencies import client
+from app.api.dependencies import client, ensure_indexes
 from fastapi.middleware.cors import CORSMiddleware
 from app.utils.logging import get_logger
 import time
@@ -27,7 +27,7 @@ app = FastAPI(
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 # Log CORS configuration for debugging
-logger.info(f"CORS Origins configured: {settings.CORS_ORIGINS}")
+logger.info("CORS Origins configured: %s", settings.CORS_ORIGINS)
 
 # Ensure CORS origins are clean (no duplicates, no wildcards mixed with specific origins)
 clean_origins = []
@@ -36,7 +36,7 @@ for origin in settings.CORS_ORIGINS:
         if origin not in clean_origins:
             clean_origins.append(origin)
 
-logger.info(f"Clean CORS Origins: {clean_origins}")
+logger.info("Clean CORS Origins: %s", clean_origins)
 
 app.add_middleware(
     CORSMiddleware,
@@ -76,8 +76,15 @@ async def startup_event():
         # This will actually test the connection
         await client.admin.command('ping')
         logger.info("✅ MongoDB Atlas connection successful!")
+        
+        try:
+            await ensure_indexes()
+            logger.info("✅ MongoDB indexes ensured")
+        except Exception as e:
+            # e.g. duplicate usernames in existing data prevent the unique index
+            logger.error("❌ Failed to create MongoDB indexes: %s", e)
     except Exception as e:
-        logger.error(f"❌ MongoDB Atlas connection failed: {str(e)}")
+        logger.error("❌ MongoDB Atlas connection failed: %s", e)
         logger.error("Please check:")
         logger.error("1. Your internet connection")
         logger.error("2. MongoDB Atlas IP whitelist settings")
@@ -86,18 +93,18 @@ async def startup_event():
     
     # Log Google OAuth configuration
     logger.info("🔐 Google OAuth Configuration:")
-    logger.info(f"   GOOGLE_CLIENT_ID: {settings.GOOGLE_CLIENT_ID}")
-    logger.info(f"   GOOGLE_CLIENT_SECRET: {'*' * 20}...{settings.GOOGLE_CLIENT_SECRET[-4:] if settings.GOOGLE_CLIENT_SECRET else 'Not set'}")
-    logger.info(f"   GOOGLE_REDIRECT_URI: {settings.GOOGLE_REDIRECT_URI}")
-    logger.info(f"   FRONTEND_URL: {settings.FRONTEND_URL}")
-    logger.info(f"   MONGO_URI: {settings.MONGO_URI}")
-    logger.info(f"   ACCESS_TOKEN_EXPIRE_MINUTES: {settings.ACCESS_TOKEN_EXPIRE_MINUTES}")
-    logger.info(f"   LOG_LEVEL: {settings.LOG_LEVEL}")
-    logger.info(f"   LOG_FORMAT: {settings.LOG_FORMAT}")
-    logger.info(f"   LOG_FILE: {settings.LOG_FILE}")
-    logger.info(f"   LOG_DATE_FORMAT: {settings.LOG_DATE_FORMAT}")
-    logger.info(f"   API_V1_STR: {settings.API_V1_STR}")
-    logger.info(f"   PROJECT_NAME: {settings.PROJECT_NAME}")
+    logger.info("   GOOGLE_CLIENT_ID: %s", settings.GOOGLE_CLIENT_ID)
+    logger.info("   GOOGLE_CLIENT_SECRET: %s...%s", '*' * 20, settings.GOOGLE_CLIENT_SECRET[-4:] if settings.GOOGLE_CLIENT_SECRET else 'Not set')
+    logger.info("   GOOGLE_REDIRECT_URI: %s", settings.GOOGLE_REDIRECT_URI)
+    logger.info("   FRONTEND_URL: %s", settings.FRONTEND_URL)
+    logger.info("   MONGO_URI: %s", settings.MONGO_URI)
+    logger.info("   ACCESS_TOKEN_EXPIRE_MINUTES: %s", settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    logger.info("   LOG_LEVEL: %s", settings.LOG_LEVEL)
+    logger.info("   LOG_FORMAT: %s", settings.LOG_FORMAT)
+    logger.info("   LOG_FILE: %s", settings.LOG_FILE)
+    logger.info("   LOG_DATE_FORMAT: %s", settings.LOG_DATE_FORMAT)
+    logger.info("   API_V1_STR: %s", settings.API_V1_STR)
+    logger.info("   PROJECT_NAME: %s", settings.PROJECT_NAME)
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -7,7 +7,7 @@ import sys
 import os
 sys.path.append('/home/roshan/fifa-rivalry-tracker')
 
-from app.utils.helpers import generate_round_robin_matches, generate_missing_matches
+from app.utils.helpers import generate_round_robin_matches, generate_missing_matches, get_result, match_outcome
 from datetime import datetime
 
 def test_generate_round_robin_matches():
@@ -138,8 +138,24 @@ def test_missing_matches_with_completed():
     
     print("✓ generate_missing_matches with completed matches test passed!")
 
+def test_match_outcome():
+    """Test match_outcome and get_result for every side of small scorelines"""
+    print("\nTesting match_outcome...")
+    
+    assert match_outcome(3, 1) == (1, 0, 0, 3)
+    assert match_outcome(1, 3) == (0, 1, 0, 0)
+    assert match_outcome(2, 2) == (0, 0, 1, 1)
+    
+    for goals_for in range(5):
+        for goals_against in range(5):
+            assert get_result(goals_for, goals_against, True) == match_outcome(goals_for, goals_against)
+            assert get_result(goals_against, goals_for, False) == match_outcome(goals_for, goals_against)
+    
+    print("✓ match_outcome test passed!")
+
 if __name__ == "__main__":
     test_generate_round_robin_matches()
     test_generate_missing_matches()
     test_missing_matches_with_completed()
+    test_match_outcome()
     print("\n🎉 All helper function tests passed!")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test script to verify batched match formatting against a fake database
+"""
+
+import asyncio
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bson import ObjectId
+from app.utils.helpers import match_helper, match_helpers_batch, matches_with_players_pipeline
+from app.utils.caches import TTLCache, invalidate_player_stats, player_name_cache, stats_cache
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return list(self.docs)
+
+
+class FakeCollection:
+    """Minimal collection supporting find({"_id": {"$in": [...]}}) and find_one({"_id": ...})"""
+
+    def __init__(self, docs):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.find_calls = []
+        self.find_one_calls = []
+
+    def find(self, query, projection=None):
+        self.find_calls.append(query)
+        ids = query["_id"]["$in"]
+        return FakeCursor([self.docs[_id] for _id in ids if _id in self.docs])
+
+    async def find_one(self, query, projection=None):
+        self.find_one_calls.append(query)
+        return self.docs.get(query["_id"])
+
+
+class FakeDB:
+    def __init__(self, users, tournaments):
+        self.users = FakeCollection(users)
+        self.tournaments = FakeCollection(tournaments)
+
+
+def build_fixture():
+    player_name_cache.clear()
+    alice = {"_id": ObjectId(), "username": "alice"}
+    bob = {"_id": ObjectId(), "username": "bob", "is_deleted": True}
+    tournament = {"_id": ObjectId(), "name": "Summer Cup"}
+    db = FakeDB([alice, bob], [tournament])
+
+    matches = [
+        {"_id": ObjectId(), "player1_id": str(alice["_id"]), "player2_id": str(bob["_id"]),
+         "player1_goals": 2, "player2_goals": 1, "tournament_id": str(tournament["_id"])},
+        {"_id": ObjectId(), "player1_id": str(alice["_id"]), "player2_id": str(ObjectId()),
+         "player1_goals": 0, "player2_goals": 0},
+        {"_id": ObjectId(), "player1_id": "not-an-object-id", "player2_id": str(alice["_id"]),
+         "player1_goals": 1, "player2_goals": 3},
+        {"_id": ObjectId(), "player1_id": str(alice["_id"]), "player2_id": None},
+    ]
+    return db, matches, tournament
+
+
+def test_match_helpers_batch():
+    """Test that batch formatting issues one $in query per collection and resolves names"""
+    print("Testing match_helpers_batch...")
+    db, matches, tournament = build_fixture()
+
+    results = asyncio.run(match_helpers_batch(matches, db))
+
+    # One $in query per collection, no per-match lookups
+    assert len(db.users.find_calls) == 1
+    assert len(db.tournaments.find_calls) == 1
+    assert db.users.find_one_calls == [] and db.tournaments.find_one_calls == []
+
+    assert [r["id"] for r in results] == [str(m["_id"]) for m in matches]
+
+    # Known and deleted players, plus tournament name
+    assert results[0]["player1_name"] == "alice"
+    assert results[0]["player2_name"] == "Deleted Player"
+    assert results[0]["tournament_name"] == "Summer Cup"
+
+    # Unknown player id
+    assert results[1]["player2_name"] == "Unknown Player"
+    assert "tournament_name" not in results[1]
+
+    # Invalid player id resolves to "Unknown Player" in the batch path
+    assert results[2]["player1_name"] == "Unknown Player"
+    assert results[2]["player2_name"] == "alice"
+
+    # Missing player id
+    assert results[3]["player1_name"] == "Unknown Player"
+    assert results[3]["player2_name"] == "Unknown Player"
+
+    print("✓ match_helpers_batch test passed!")
+
+
+def test_match_helpers_batch_with_tournaments_cache():
+    """Test that a pre-filled tournaments_cache skips the tournaments query"""
+    print("\nTesting match_helpers_batch with tournaments_cache...")
+    db, matches, tournament = build_fixture()
+
+    results = asyncio.run(match_helpers_batch(matches, db, {str(tournament["_id"]): tournament}))
+
+    assert db.tournaments.find_calls == []
+    assert results[0]["tournament_name"] == "Summer Cup"
+
+    print("✓ match_helpers_batch with tournaments_cache test passed!")
+
+
+def test_match_helper_caches():
+    """Test that match_helper resolves names from caches without querying"""
+    print("\nTesting match_helper with caches...")
+    db, matches, tournament = build_fixture()
+    players_cache = {str(doc["_id"]): doc for doc in db.users.docs.values()}
+    tournaments_cache = {str(tournament["_id"]): tournament}
+
+    result = asyncio.run(match_helper(matches[0], db, players_cache, tournaments_cache))
+
+    assert db.users.find_one_calls == [] and db.tournaments.find_one_calls == []
+    assert result["player1_name"] == "alice"
+    assert result["player2_name"] == "Deleted Player"
+    assert result["tournament_name"] == "Summer Cup"
+
+    # Without caches, match_helper still queries and an invalid id produces "Error"
+    result = asyncio.run(match_helper(matches[2], db))
+    assert result["player1_name"] == "Error"
+
+    print("✓ match_helper with caches test passed!")
+
+
+def test_player_name_cache():
+    """Test that resolved players are served from the TTL cache on later calls"""
+    print("\nTesting player name cache...")
+    db, matches, tournament = build_fixture()
+
+    asyncio.run(match_helpers_batch(matches, db))
+    results = asyncio.run(match_helpers_batch(matches, db))
+
+    # Only the unknown ids are queried again
+    assert len(db.users.find_calls) == 2
+    assert all(player_name_cache.get(str(_id)) is not None for _id in db.users.docs)
+    assert results[0]["player1_name"] == "alice"
+
+    result = asyncio.run(match_helper(matches[0], db))
+    assert len(db.users.find_one_calls) == 0
+    assert result["player2_name"] == "Deleted Player"
+
+    # Expired entries and evicted keys are not returned
+    cache = TTLCache(maxsize=2, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    cache = TTLCache(maxsize=2, ttl=30)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.get("a") is None and cache.get("c") == "c" and len(cache) == 2
+
+    # Stats are invalidated under the canonical id whatever the casing of the given id
+    player_id = str(ObjectId())
+    stats_cache.set(("detailed", player_id), {})
+    invalidate_player_stats(player_id.upper())
+    assert stats_cache.get(("detailed", player_id)) is None
+
+    print("✓ player name cache test passed!")
+
+
+def test_embedded_players():
+    """Test that players and tournaments joined by matches_with_players_pipeline are used without querying"""
+    print("\nTesting embedded player documents...")
+    db, matches, tournament = build_fixture()
+    alice, bob = db.users.docs.values()
+    embedded = [
+        dict(matches[0], player1=alice, player2=bob, tournament=tournament),
+        dict(matches[1], player1=alice, player2=None),
+    ]
+
+    results = asyncio.run(match_helpers_batch(embedded, db))
+    assert db.users.find_calls == [] and db.tournaments.find_calls == []
+    assert results[0]["player1_name"] == "alice"
+    assert results[0]["player2_name"] == "Deleted Player"
+    assert results[1]["player2_name"] == "Unknown Player"
+    assert "player1" not in results[0]
+
+    result = asyncio.run(match_helper(embedded[0], db))
+    assert db.users.find_one_calls == [] and db.tournaments.find_one_calls == []
+    assert result["player1_name"] == "alice"
+    assert result["tournament_name"] == "Summer Cup"
+
+    pipeline = matches_with_players_pipeline({"tournament_id": "t"}, {"date": -1}, 10, skip=20)
+    assert [next(iter(stage)) for stage in pipeline] == ["$match", "$sort", "$skip", "$limit"] + ["$lookup", "$set"] * 3
+    assert [stage["$lookup"]["as"] for stage in pipeline if "$lookup" in stage] == ["player1", "player2", "tournament"]
+    pipeline = matches_with_players_pipeline(include_tournament=False)
+    assert [stage["$lookup"]["as"] for stage in pipeline if "$lookup" in stage] == ["player1", "player2"]
+
+    print("✓ embedded player documents test passed!")
+
+
+if __name__ == "__main__":
+    test_match_helpers_batch()
+    test_match_helpers_batch_with_tournaments_cache()
+    test_match_helper_caches()
+    test_player_name_cache()
+    test_embedded_players()
+    print("\n🎉 All match helper tests passed!")